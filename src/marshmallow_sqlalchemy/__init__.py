@@ -3,27 +3,36 @@ from .convert import (
     column2field,
     field_for,
     fields_for_model,
+    profile_conversion,
     property2field,
 )
-from .exceptions import ModelConversionError
+from .exceptions import ModelConversionError, UnloadedAttributeError
 from .schema import (
     SQLAlchemyAutoSchema,
     SQLAlchemyAutoSchemaOpts,
+    SQLAlchemyPolymorphicSchema,
     SQLAlchemySchema,
     SQLAlchemySchemaOpts,
     auto_field,
+    schemas_for_metadata,
+    warm_up_all,
 )
 
 __all__ = [
     "SQLAlchemySchema",
     "SQLAlchemyAutoSchema",
+    "SQLAlchemyPolymorphicSchema",
     "SQLAlchemySchemaOpts",
     "SQLAlchemyAutoSchemaOpts",
     "auto_field",
+    "schemas_for_metadata",
+    "warm_up_all",
     "ModelConverter",
     "fields_for_model",
     "property2field",
     "column2field",
     "ModelConversionError",
+    "UnloadedAttributeError",
+    "profile_conversion",
     "field_for",
 ]
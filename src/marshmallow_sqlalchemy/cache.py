@@ -0,0 +1,275 @@
+"""Process-wide caches that survive across loads and dumps.
+
+Cache entries are tagged with the identity key of the row they were computed
+from and are invalidated by the ``after_update`` and ``after_delete`` mapper
+events of the cached model. Events are only seen for flushes made in the current
+process; use ``ttl`` to bound staleness from writes made elsewhere.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import sqlalchemy as sa
+from sqlalchemy.orm import InstanceState, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+_MISSING = object()
+
+
+class _LRUCache:
+    """Minimal thread-safe LRU mapping.
+
+    :param int maxsize: Maximum number of entries.
+    """
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1.")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class _IdentityLRUCache:
+    """Thread-safe LRU cache with an optional TTL, invalidated by identity key.
+
+    :param int maxsize: Maximum number of entries.
+    :param float ttl: Optional time to live of an entry, in seconds.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._keys_by_identity = {}
+        self._watched_models = set()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key):
+        try:
+            hash(key)
+        except TypeError:
+            return _MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            identity_key, expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                self._discard(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, model, identity_key, value):
+        try:
+            hash(key)
+        except TypeError:
+            return
+        self._watch(model)
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (identity_key, expires, value)
+            self._keys_by_identity.setdefault(identity_key, set()).add(key)
+            while len(self._entries) > self.maxsize:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_identity.get(entry[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_identity[entry[0]]
+
+    def invalidate(self, identity_key):
+        """Remove all entries computed from the row with the given identity key."""
+        with self._lock:
+            for key in self._keys_by_identity.pop(identity_key, ()):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_identity.clear()
+
+    def _watch(self, model):
+        if model in self._watched_models:
+            return
+        with self._lock:
+            if model not in self._watched_models:
+                sa.event.listen(model, "after_update", self._on_update, propagate=True)
+                sa.event.listen(model, "after_delete", self._on_delete, propagate=True)
+                self._watched_models.add(model)
+
+    def _on_update(self, mapper, connection, target):
+        # ``after_update`` is also emitted for instances whose only changes are
+        # to collections (e.g. a backref append), which do not affect cached rows.
+        session = sa.orm.object_session(target)
+        if session is None or session.is_modified(target, include_collections=False):
+            self.invalidate(sa.inspect(target).identity_key)
+
+    def _on_delete(self, mapper, connection, target):
+        self.invalidate(sa.inspect(target).identity_key)
+
+
+class RelatedCache(_IdentityLRUCache):
+    """Cache of the rows looked up by `Related <marshmallow_sqlalchemy.fields.Related>`
+    fields, for small and rarely changing reference tables (e.g. countries or
+    currencies).
+
+    The cache maps lookup keys to a snapshot of the loaded column values. On a hit,
+    the snapshot is merged into the current session with ``load=False``, so no query
+    is emitted. Pass the same instance to several fields to share cached rows
+    between them. ::
+
+        currency_cache = RelatedCache(maxsize=256, ttl=600)
+
+
+        class PriceSchema(SQLAlchemySchema):
+            class Meta:
+                model = Price
+
+            currency = Related(cache=currency_cache)
+
+    :param int maxsize: Maximum number of cached rows.
+    :param float ttl: Optional time to live of a cached row, in seconds.
+    """
+
+    def get_instance(self, session, related_model, key):
+        """Return the cached instance for ``key`` merged into ``session``,
+        or `None` on a cache miss.
+
+        If ``session`` already holds the instance, it is returned as-is, so that
+        its pending changes are not overwritten by the cached values.
+        """
+        cached = self._get((related_model, key))
+        if cached is _MISSING:
+            return None
+        class_, identity_key, values = cached
+        existing = session.identity_map.get(identity_key)
+        if existing is not None:
+            return existing
+        instance = sa.inspect(class_).class_manager.new_instance()
+        for attr, value in values.items():
+            set_committed_value(instance, attr, value)
+        make_transient_to_detached(instance)
+        return session.merge(instance, load=False)
+
+    def add_instance(self, related_model, key, instance):
+        """Cache the column values of a persistent ``instance`` under ``key``."""
+        state = sa.inspect(instance)
+        if state.identity_key is None:
+            return
+        values = {
+            prop.key: state.dict[prop.key]
+            for prop in state.mapper.column_attrs
+            if prop.key in state.dict
+        }
+        self._set(
+            (related_model, key),
+            related_model,
+            state.identity_key,
+            (state.class_, state.identity_key, values),
+        )
+
+
+class DumpCache(_IdentityLRUCache):
+    """Cache of serialized rows, for schemas that repeatedly dump the same rows.
+
+    Entries are keyed by schema class, dumped fields, identity key and, if the
+    model has a ``version_id_col``, the version of the row, so a new version is
+    never served a stale representation. With the ``dump_unloaded`` option, the
+    unloaded attributes of the row are part of the key as well. Instances with pending changes are not
+    cached. Set it on a schema's ``Meta``; a cache may be shared by several
+    schemas. ::
+
+        feed_cache = DumpCache(maxsize=10_000)
+
+
+        class ArticleSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = Article
+                dump_cache = feed_cache
+
+    .. note::
+
+        Only changes to the dumped row itself invalidate its entries. Do not use
+        it with schemas whose output depends on other rows (e.g. ``Nested``
+        fields) or on the schema context, unless ``ttl`` bounds the staleness.
+
+    :param int maxsize: Maximum number of cached representations.
+    :param float ttl: Optional time to live of a cached representation, in seconds.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+
+    def get_key(self, schema, obj, *, tag=None):
+        """Return the cache key of ``obj`` dumped by ``schema``, or `None` if
+        ``obj`` must not be cached (e.g. it is not persistent or has pending changes).
+        """
+        state = sa.inspect(obj, raiseerr=False)
+        if (
+            not isinstance(state, InstanceState)
+            or state.identity_key is None
+            or state.modified
+            or state.deleted
+            or state.was_deleted
+        ):
+            return None
+        mapper = state.mapper
+        version = (
+            getattr(obj, mapper.get_property_by_column(mapper.version_id_col).key)
+            if mapper.version_id_col is not None
+            else None
+        )
+        # With ``dump_unloaded``, the output also depends on which attributes are loaded
+        unloaded = (
+            frozenset(state.unloaded) if schema.opts.dump_unloaded is not None else None
+        )
+        return (
+            type(schema),
+            tuple(schema.dump_fields),
+            tag,
+            state.identity_key,
+            version,
+            unloaded,
+        )
+
+    def get_data(self, key):
+        """Return the data cached under ``key``, or `None` on a cache miss."""
+        data = self._get(key)
+        return None if data is _MISSING else data
+
+    def add_data(self, key, data):
+        """Cache serialized ``data`` under a key returned by `get_key`."""
+        identity_key = key[3]
+        self._set(key, identity_key[0], identity_key, data)
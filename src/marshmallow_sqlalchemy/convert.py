@@ -1,5 +1,11 @@
+import atexit
+import contextlib
 import functools
 import inspect
+import os
+import sys
+import threading
+import time
 import uuid
 
 import marshmallow as ma
@@ -46,6 +52,178 @@ def _enum_field_factory(converter, data_type):
     return fields.Enum if data_type.enum_class else fields.Field
 
 
+def _get_python_type(column):
+    try:
+        return column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+class _NativeTypeMixin:
+    """Field mixin that returns input values whose type is exactly ``native_type``
+    as-is instead of deserializing them. Null handling and validators still apply.
+    """
+
+    native_type = None
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if type(value) is self.native_type:
+            return value
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
+# Subclasses of field classes with `_NativeTypeMixin`, keyed by field class
+_native_field_classes = {}
+
+
+def _native_field_class(field_class):
+    native_class = _native_field_classes.get(field_class)
+    if native_class is None:
+        native_class = _native_field_classes.setdefault(
+            field_class,
+            type(
+                field_class.__name__,
+                (_NativeTypeMixin, field_class),
+                {"__module__": field_class.__module__, "base_field_class": field_class},
+            ),
+        )
+    return native_class
+
+
+# Validators generated for columns, keyed by class and arguments, so that
+# identical validators (e.g. ``Length(max=255)``) are shared between fields.
+_interned_validators = {}
+
+
+def _intern_validator(validator_class, **kwargs):
+    key = (
+        validator_class,
+        tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(kwargs.items())
+        ),
+    )
+    validator = _interned_validators.get(key)
+    if validator is None:
+        validator = _interned_validators.setdefault(key, validator_class(**kwargs))
+    return validator
+
+
+class ConversionProfile:
+    """Time spent converting models and tables to fields, as recorded by
+    `profile_conversion`.
+
+    Timings are inclusive: the time of a ``fields_for_model`` call includes the
+    time of the ``property2field`` calls it makes.
+
+    :ivar dict timings: Mapping of ``(method name, key)`` to ``[number of calls,
+        total seconds]``, where ``key`` is the model, table or column type name.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def add(self, method, key, seconds):
+        with self._lock:
+            timing = self.timings.setdefault((method, key), [0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+
+    def report(self, limit=None):
+        """Return the timings as a table sorted by total time, slowest first.
+
+        :param int limit: Maximum number of rows.
+        """
+        rows = sorted(self.timings.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [
+            f"{'method':<32} {'key':<40} {'calls':>7} {'total ms':>10} {'ms/call':>9}"
+        ]
+        for (method, key), (calls, seconds) in rows[:limit]:
+            lines.append(
+                f"{method:<32} {key:<40} {calls:>7} {seconds * 1000:>10.3f}"
+                f" {seconds * 1000 / calls:>9.3f}"
+            )
+        return "\n".join(lines)
+
+
+_active_profile = None
+
+
+@contextlib.contextmanager
+def profile_conversion():
+    """Record the time spent in `ModelConverter` per model, table and column type
+    while the context is active. Schemas are converted when their class is
+    created, so define or import them inside the block. ::
+
+        with profile_conversion() as profile:
+            import myapp.schemas
+        print(profile.report(limit=20))
+
+    Profiling can also be enabled for the whole process by setting the
+    ``MARSHMALLOW_SQLALCHEMY_PROFILE`` environment variable, in which case the
+    report is printed to stderr at exit.
+
+    :return: A `ConversionProfile`.
+    """
+    global _active_profile
+    previous = _active_profile
+    profile = _active_profile = ConversionProfile()
+    try:
+        yield profile
+    finally:
+        _active_profile = previous
+
+
+if os.environ.get("MARSHMALLOW_SQLALCHEMY_PROFILE"):
+    _active_profile = ConversionProfile()
+    atexit.register(lambda: print(_active_profile.report(), file=sys.stderr))
+
+
+def _profiled(get_key):
+    """Record the calls of a `ModelConverter` method in the active profile."""
+
+    def decorator(method):
+        # Name of the argument the key is computed from
+        arg_name = list(inspect.signature(method).parameters)[1]
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profile = _active_profile
+            if profile is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                arg = args[0] if args else kwargs[arg_name]
+                profile.add(method.__name__, get_key(arg), time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def _model_name(model):
+    return model.__name__
+
+
+def _table_name(table):
+    return table.name
+
+
+def _property_model_name(prop):
+    return prop.parent.class_.__name__
+
+
+def _column_table_name(column):
+    return column.table.name if column.table is not None else column.key
+
+
+def _type_name(data_type):
+    return type(data_type).__name__
+
+
 def _field_update_kwargs(field_class, field_kwargs, kwargs):
     if not kwargs:
         return field_kwargs
@@ -103,6 +281,9 @@ class ModelConverter:
 
     def __init__(self, schema_cls=None):
         self.schema_cls = schema_cls
+        # Mapping of SQLAlchemy type class -> matching `SQLA_TYPE_MAPPING` entry
+        # (or None), so the MRO of each type class is only searched once.
+        self._sqla_type_mapping_cache = {}
 
     @property
     def type_mapping(self):
@@ -111,6 +292,7 @@ class ModelConverter:
         else:
             return ma.Schema.TYPE_MAPPING
 
+    @_profiled(_model_name)
     def fields_for_model(
         self,
         model,
@@ -121,6 +303,7 @@ class ModelConverter:
         exclude=None,
         base_fields=None,
         dict_cls=dict,
+        trust_native_types=False,
     ):
         result = dict_cls()
         base_fields = base_fields or {}
@@ -144,11 +327,14 @@ class ModelConverter:
                         continue
             if not include_relationships and hasattr(prop, "direction"):
                 continue
-            field = base_fields.get(key) or self.property2field(prop)
+            field = base_fields.get(key) or self.property2field(
+                prop, trust_native_types=trust_native_types
+            )
             if field:
                 result[key] = field
         return result
 
+    @_profiled(_table_name)
     def fields_for_table(
         self,
         table,
@@ -158,6 +344,7 @@ class ModelConverter:
         exclude=None,
         base_fields=None,
         dict_cls=dict,
+        trust_native_types=False,
     ):
         result = dict_cls()
         base_fields = base_fields or {}
@@ -171,12 +358,23 @@ class ModelConverter:
                 continue
             # Overridden fields are specified relative to key generated by
             # self._get_key_for_column(...), rather than keys in source model
-            field = base_fields.get(key) or self.column2field(column)
+            field = base_fields.get(key) or self.column2field(
+                column, trust_native_types=trust_native_types
+            )
             if field:
                 result[key] = field
         return result
 
-    def property2field(self, prop, *, instance=True, field_class=None, **kwargs):
+    @_profiled(_property_model_name)
+    def property2field(
+        self,
+        prop,
+        *,
+        instance=True,
+        field_class=None,
+        trust_native_types=False,
+        **kwargs,
+    ):
         # handle synonyms
         # Attribute renamed "_proxied_object" in 1.4
         for attr in ("_proxied_property", "_proxied_object"):
@@ -188,7 +386,12 @@ class ModelConverter:
             return field_class
         field_kwargs = self._get_field_kwargs_for_property(prop)
         _field_update_kwargs(field_class, field_kwargs, kwargs)
-        ret = field_class(**field_kwargs)
+        if trust_native_types and hasattr(prop, "columns"):
+            ret = self._make_native_field(
+                field_class, field_kwargs, _base_column(prop.columns[0])
+            )
+        else:
+            ret = field_class(**field_kwargs)
         if (
             hasattr(prop, "direction")
             and self.DIRECTION_MAPPING[prop.direction.name]
@@ -200,16 +403,38 @@ class ModelConverter:
             ret = RelatedList(ret, **related_list_kwargs)
         return ret
 
-    def column2field(self, column, *, instance=True, **kwargs):
+    @_profiled(_column_table_name)
+    def column2field(
+        self, column, *, instance=True, trust_native_types=False, **kwargs
+    ):
         field_class = self._get_field_class_for_column(column)
         if not instance:
             return field_class
         field_kwargs = self.get_base_kwargs()
         self._add_column_kwargs(field_kwargs, column)
         _field_update_kwargs(field_class, field_kwargs, kwargs)
+        if trust_native_types:
+            return self._make_native_field(field_class, field_kwargs, column)
         return field_class(**field_kwargs)
 
-    def field_for(self, model, property_name, **kwargs):
+    def _make_native_field(self, field_class, field_kwargs, column):
+        """Instantiate ``field_class``, or a subclass of it that passes through
+        input values whose type is exactly the column's ``python_type``.
+        """
+        python_type = _get_python_type(column)
+        # Number fields check special values and round decimals when they
+        # deserialize, which are constraints of the column rather than parsing
+        if (
+            python_type is None
+            or not _is_field(field_class)
+            or issubclass(field_class, fields.Number)
+        ):
+            return field_class(**field_kwargs)
+        field = _native_field_class(field_class)(**field_kwargs)
+        field.native_type = python_type
+        return field
+
+    def field_for(self, model, property_name, *, trust_native_types=False, **kwargs):
         target_model = model
         prop_name = property_name
         attr = getattr(model, property_name)
@@ -219,7 +444,9 @@ class ModelConverter:
             prop_name = attr.value_attr
             remote_with_local_multiplicity = attr.local_attr.prop.uselist
         prop = target_model.__mapper__.attrs.get(prop_name)
-        converted_prop = self.property2field(prop, **kwargs)
+        converted_prop = self.property2field(
+            prop, trust_native_types=trust_native_types, **kwargs
+        )
         if remote_with_local_multiplicity:
             related_list_kwargs = _field_update_kwargs(
                 RelatedList, self.get_base_kwargs(), kwargs
@@ -234,16 +461,26 @@ class ModelConverter:
     def _get_field_class_for_column(self, column):
         return self._get_field_class_for_data_type(column.type)
 
-    def _get_field_class_for_data_type(self, data_type):
+    def _get_sqla_type_mapping(self, type_cls):
+        try:
+            return self._sqla_type_mapping_cache[type_cls]
+        except KeyError:
+            pass
         field_cls = None
-        types = inspect.getmro(type(data_type))
-        # First search for a field class from self.SQLA_TYPE_MAPPING
-        for col_type in types:
+        for col_type in inspect.getmro(type_cls):
             if col_type in self.SQLA_TYPE_MAPPING:
                 field_cls = self.SQLA_TYPE_MAPPING[col_type]
-                if callable(field_cls) and not _is_field(field_cls):
-                    field_cls = field_cls(self, data_type)
                 break
+        self._sqla_type_mapping_cache[type_cls] = field_cls
+        return field_cls
+
+    @_profiled(_type_name)
+    def _get_field_class_for_data_type(self, data_type):
+        # First search for a field class from self.SQLA_TYPE_MAPPING
+        field_cls = self._get_sqla_type_mapping(type(data_type))
+        if field_cls is not None:
+            if callable(field_cls) and not _is_field(field_cls):
+                field_cls = field_cls(self, data_type)
         else:
             # Try to find a field class based on the column's python_type
             try:
@@ -257,7 +494,7 @@ class ModelConverter:
                 if hasattr(data_type, "impl"):
                     return self._get_field_class_for_data_type(data_type.impl)
                 raise ModelConversionError(
-                    f"Could not find field column of type {types[0]}."
+                    f"Could not find field column of type {type(data_type)}."
                 )
         return field_cls
 
@@ -303,7 +540,9 @@ class ModelConverter:
             kwargs["dump_only"] = True
 
         if hasattr(column.type, "enums") and not kwargs.get("dump_only"):
-            kwargs["validate"].append(validate.OneOf(choices=column.type.enums))
+            kwargs["validate"].append(
+                _intern_validator(validate.OneOf, choices=column.type.enums)
+            )
 
         if hasattr(column.type, "enum_class"):
             kwargs["enum"] = column.type.enum_class
@@ -314,12 +553,11 @@ class ModelConverter:
         if hasattr(column.type, "length") and not kwargs.get("dump_only"):
             column_length = column.type.length
             if column_length is not None:
-                try:
-                    python_type = column.type.python_type
-                except (AttributeError, NotImplementedError):
-                    python_type = None
+                python_type = _get_python_type(column)
                 if not python_type or not issubclass(python_type, uuid.UUID):
-                    kwargs["validate"].append(validate.Length(max=column_length))
+                    kwargs["validate"].append(
+                        _intern_validator(validate.Length, max=column_length)
+                    )
 
         if getattr(column.type, "asdecimal", False):
             kwargs["places"] = getattr(column.type, "scale", None)
@@ -357,6 +595,8 @@ Note: SynonymProperties are ignored. Use an explicit field if you want to includ
 :param model: The SQLAlchemy model
 :param bool include_fk: Whether to include foreign key fields in the output.
 :param bool include_relationships: Whether to include relationships fields in the output.
+:param bool trust_native_types: If `True`, input values whose type is exactly the
+    column's ``python_type`` are loaded as-is instead of being deserialized.
 :return: dict of field_name: Field instance pairs
 """
 
@@ -366,6 +606,8 @@ property2field = default_converter.property2field
 :param Property prop: SQLAlchemy Property.
 :param bool instance: If `True`, return  `Field` instance, computing relevant kwargs
     from the given property. If `False`, return the `Field` class.
+:param bool trust_native_types: If `True`, input values whose type is exactly the
+    column's ``python_type`` are loaded as-is instead of being deserialized.
 :param kwargs: Additional keyword arguments to pass to the field constructor.
 :return: A `marshmallow.fields.Field` class or instance.
 """
@@ -376,6 +618,8 @@ column2field = default_converter.column2field
 :param sqlalchemy.schema.Column column: SQLAlchemy Column.
 :param bool instance: If `True`, return  `Field` instance, computing relevant kwargs
     from the given property. If `False`, return the `Field` class.
+:param bool trust_native_types: If `True`, input values whose type is exactly the
+    column's ``python_type`` are loaded as-is instead of being deserialized.
 :return: A `marshmallow.fields.Field` class or instance.
 """
 
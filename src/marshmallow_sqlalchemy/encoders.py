@@ -0,0 +1,100 @@
+"""JSON encoding used by `SQLAlchemySchema.dump_json <marshmallow_sqlalchemy.SQLAlchemySchema.dump_json>`.
+
+Values of columns whose types are natively supported by the JSON encoder
+(e.g. datetimes and UUIDs with orjson) are passed to the encoder as-is instead of
+being formatted by their field first.
+"""
+
+import datetime as dt
+import decimal
+import enum
+import json
+import uuid
+
+from marshmallow import fields
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _identity(value):
+    return value
+
+
+def _enum_name(value):
+    return value.name
+
+
+def _enum_value(value):
+    return value.value
+
+
+def default(value):
+    """Encode a value that is not natively supported by the JSON encoder.
+
+    Dates and times are encoded in ISO 8601 format, and UUIDs and decimals as strings.
+    """
+    if isinstance(value, (dt.datetime, dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode(data):
+    """Encode ``data`` to JSON bytes, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=default)
+    return json.dumps(data, default=default, separators=(",", ":")).encode()
+
+
+def get_fast_serializer(field):
+    """Return a ``(types, function)`` pair such that values whose type is in ``types``
+    serialize to ``function(value)`` for ``field``, bypassing `Field.serialize`.
+    Return `None` if ``field`` must be serialized by marshmallow.
+
+    Only exact field classes are matched, since subclasses may override ``_serialize``,
+    and only with the options that do not change how values are serialized.
+    Fields generated with ``trust_native_types`` match their base field class.
+    """
+    field_class = getattr(type(field), "base_field_class", type(field))
+    if isinstance(field, fields.Number) and field.as_string:
+        return None
+    if field_class in (fields.String, fields.Email, fields.URL):
+        return (str,), _identity
+    if field_class is fields.Integer:
+        return (int,), _identity
+    if field_class is fields.Float:
+        return (float, int), float
+    if field_class is fields.Boolean:
+        return (bool,), _identity
+    if field_class is fields.Raw:
+        return (str, int, float, bool, dict, list), _identity
+    if field_class is fields.UUID:
+        return (uuid.UUID,), _identity if orjson is not None else str
+    if field_class in (fields.DateTime, fields.NaiveDateTime, fields.AwareDateTime):
+        if field.format in ("iso", "iso8601"):
+            return (dt.datetime,), _identity if orjson is not None else default
+    if field_class is fields.Date:
+        if field.format in ("iso", "iso8601"):
+            return (dt.date,), _identity if orjson is not None else default
+    if field_class is fields.Enum and not field.by_value:
+        return (field.enum,), _enum_name
+    if field_class is fields.Enum and field.by_value is True:
+        return (field.enum,), _enum_value
+    if field_class is fields.List:
+        inner = get_fast_serializer(field.inner)
+        if inner is not None and inner[1] is _identity:
+            inner_types = inner[0]
+
+            def serialize_list(value):
+                if all(item is None or type(item) in inner_types for item in value):
+                    return value
+                return field._serialize(value, None, None)
+
+            return (list,), serialize_list
+    return None
@@ -10,6 +10,12 @@ class ModelConversionError(MarshmallowSQLAlchemyError):
     """
 
 
+class UnloadedAttributeError(MarshmallowSQLAlchemyError):
+    """Raised when dumping an attribute that is not loaded, with the
+    ``dump_unloaded = RAISE`` option.
+    """
+
+
 class IncorrectSchemaTypeError(ModelConversionError):
     """Raised when a ``SQLAlchemyAutoField`` is bound to ``Schema`` that
     is not an instance of ``SQLAlchemySchema``.
@@ -1,18 +1,86 @@
+import contextlib
+import contextvars
+import operator
 import warnings
+import weakref
 
-from marshmallow import fields
-from marshmallow.utils import is_iterable_but_not_string
-from sqlalchemy import inspect
+import sqlalchemy as sa
+from marshmallow import ValidationError, fields
+from marshmallow.utils import is_collection, is_iterable_but_not_string
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapper
 from sqlalchemy.orm.exc import NoResultFound
 
 
+def key_getter(keys):
+    """Return a function returning the tuple of the values of the attributes
+    named in ``keys`` of an instance.
+    """
+    getter = operator.attrgetter(*keys)
+    if len(keys) > 1:
+        return getter
+    return lambda instance: (getter(instance),)
+
+
+def key_in(columns, keys):
+    """Return a criterion matching the rows whose values of ``columns`` are one of
+    the tuples in ``keys``.
+    """
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    return sa.tuple_(*columns).in_(list(keys))
+
+
+class PrimaryKeyInfo:
+    """Primary key metadata of a mapper, as returned by `get_primary_key_info`.
+
+    :ivar tuple props: Primary key properties.
+    :ivar tuple keys: Attribute names of the primary key properties.
+    :ivar get_key: Function returning the primary key tuple of an instance.
+    """
+
+    __slots__ = ("props", "keys", "get_key")
+
+    def __init__(self, mapper):
+        self.props = tuple(
+            mapper.get_property_by_column(column) for column in mapper.primary_key
+        )
+        self.keys = tuple(prop.key for prop in self.props)
+        self.get_key = key_getter(self.keys)
+
+    def key_from_mapping(self, data):
+        """Return the primary key tuple of a mapping of attribute names to values."""
+        return tuple([data.get(key) for key in self.keys])
+
+
+_primary_key_info = weakref.WeakKeyDictionary()
+
+
+@event.listens_for(Mapper, "after_configured")
+def _clear_primary_key_info():
+    _primary_key_info.clear()
+
+
+def get_primary_key_info(model):
+    """Get the cached `PrimaryKeyInfo` of a SQLAlchemy model.
+
+    The cache is cleared whenever mappers are (re)configured.
+
+    :param model: SQLAlchemy model class
+    """
+    mapper = model.__mapper__
+    info = _primary_key_info.get(mapper)
+    if info is None:
+        info = _primary_key_info[mapper] = PrimaryKeyInfo(mapper)
+    return info
+
+
 def get_primary_keys(model):
     """Get primary key properties for a SQLAlchemy model.
 
     :param model: SQLAlchemy model class
     """
-    mapper = model.__mapper__
-    return [mapper.get_property_by_column(column) for column in mapper.primary_key]
+    return list(get_primary_key_info(model).props)
 
 
 def ensure_list(value):
@@ -20,6 +88,10 @@ def ensure_list(value):
 
 
 class RelatedList(fields.List):
+    """List of `Related` values. The existing related instances of all values
+    are retrieved with a single query.
+    """
+
     def get_value(self, obj, attr, accessor=None):
         # Do not call `fields.List`'s get_value as it calls the container's
         # `get_value` if the container has `attribute`.
@@ -27,6 +99,55 @@ class RelatedList(fields.List):
         # so the special handling is avoided.
         return super(fields.List, self).get_value(obj, attr, accessor=accessor)
 
+    def _deserialize(self, value, attr, data, **kwargs):
+        if (
+            isinstance(self.inner, Related)
+            and is_collection(value)
+            and len(value) > 1
+            and "related_instances" not in kwargs
+        ):
+            kwargs["related_instances"] = self.inner._get_existing_instances(value)
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
+class ForeignKeyReference:
+    """Reference to a related row, deserialized by a `Related` field with
+    ``reference_only=True``.
+
+    `SQLAlchemySchema <marshmallow_sqlalchemy.SQLAlchemySchema>` replaces it with
+    the local foreign key values it holds when loading.
+
+    :ivar dict values: Mapping of local foreign key attribute names to values.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = values
+
+    def __eq__(self, other):
+        if not isinstance(other, ForeignKeyReference):
+            return NotImplemented
+        return self.values == other.values
+
+    def __hash__(self):
+        return hash(tuple(self.values.items()))
+
+    def __repr__(self):
+        return f"<ForeignKeyReference({self.values!r})>"
+
+
+def expand_foreign_key_references(data):
+    """Replace the `ForeignKeyReference` values of ``data``, in place, with the
+    foreign key values they hold.
+    """
+    references = [
+        key for key, value in data.items() if isinstance(value, ForeignKeyReference)
+    ]
+    for key in references:
+        data.update(data.pop(key).values)
+    return data
+
 
 class Related(fields.Field):
     """Related data represented by a SQLAlchemy `relationship`. Must be attached
@@ -35,6 +156,13 @@ class Related(fields.Field):
 
     :param list columns: Optional column names on related model. If not provided,
         the primary key(s) of the related model will be used.
+    :param RelatedCache cache: Optional `RelatedCache <marshmallow_sqlalchemy.cache.RelatedCache>`
+        used to look up related instances without querying the database.
+    :param bool reference_only: For many-to-one relationships, deserialize to a
+        `ForeignKeyReference` that sets the local foreign key column(s) of the loaded
+        instance instead of loading the related instance. The key values are
+        deserialized by the fields generated for the related key columns, but the
+        existence of the related row is not checked.
     """
 
     default_error_messages = {
@@ -42,7 +170,9 @@ class Related(fields.Field):
         "expected a dictionary with keys {keys!r}"
     }
 
-    def __init__(self, columns=None, column=None, **kwargs):
+    def __init__(
+        self, columns=None, column=None, *, cache=None, reference_only=False, **kwargs
+    ):
         if column is not None:
             warnings.warn(
                 "`column` parameter is deprecated and will be removed in future releases. "
@@ -54,6 +184,18 @@ class Related(fields.Field):
                 columns = column
         super().__init__(**kwargs)
         self.columns = ensure_list(columns or [])
+        self.cache = cache
+        self.reference_only = reference_only
+        # Mapping of (model, attribute) -> (related model, related keys, key names).
+        # Shared by the copies of this field made for each schema instance.
+        self._resolved = {}
+        # Mapping of (model, attribute) -> ((local attribute, related key), ...)
+        self._foreign_keys = {}
+        # Mapping of (model, attribute) -> {related key: field}
+        self._key_fields = {}
+        # Mapping of (model, attribute) -> statement selecting a related instance
+        # by its related keys, with one bound parameter per key.
+        self._statements = {}
 
     @property
     def model(self):
@@ -61,17 +203,75 @@ class Related(fields.Field):
 
     @property
     def related_model(self):
-        model_attr = getattr(self.model, self.attribute or self.name)
-        if hasattr(model_attr, "remote_attr"):  # handle association proxies
-            model_attr = model_attr.remote_attr
-        return model_attr.property.mapper.class_
+        return self._resolve()[0]
 
     @property
     def related_keys(self):
-        if self.columns:
-            insp = inspect(self.related_model)
-            return [insp.attrs[column] for column in self.columns]
-        return get_primary_keys(self.related_model)
+        return self._resolve()[1]
+
+    def _resolve(self):
+        return self._resolve_for(self.model, self.attribute or self.name)
+
+    def _resolve_for(self, model, attribute):
+        key = (model, attribute)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            model_attr = getattr(model, attribute)
+            if hasattr(model_attr, "remote_attr"):  # handle association proxies
+                model_attr = model_attr.remote_attr
+            related_model = model_attr.property.mapper.class_
+            if self.columns:
+                insp = inspect(related_model)
+                related_keys = [insp.attrs[column] for column in self.columns]
+            else:
+                related_keys = get_primary_keys(related_model)
+            resolved = self._resolved[key] = (
+                related_model,
+                related_keys,
+                tuple(prop.key for prop in related_keys),
+            )
+        return resolved
+
+    def _get_foreign_keys(self):
+        """Return pairs of (local foreign key attribute, related key name)."""
+        key = (self.model, self.attribute or self.name)
+        foreign_keys = self._foreign_keys.get(key)
+        if foreign_keys is None:
+            prop = getattr(self.model, self.attribute or self.name).property
+            if prop.direction.name != "MANYTOONE":
+                raise ValueError(
+                    f"`reference_only` requires a many-to-one relationship, "
+                    f"not {prop}."
+                )
+            related_keys = {prop_.columns[0]: prop_.key for prop_ in self.related_keys}
+            mapper = inspect(self.model)
+            try:
+                foreign_keys = tuple(
+                    (mapper.get_property_by_column(local).key, related_keys[remote])
+                    for local, remote in prop.local_remote_pairs
+                )
+            except KeyError as error:
+                raise ValueError(
+                    f"`reference_only` requires the related keys of {prop} "
+                    f"to be the columns referenced by its foreign key."
+                ) from error
+            foreign_keys = self._foreign_keys[key] = foreign_keys
+        return foreign_keys
+
+    def _get_key_fields(self):
+        """Return a mapping of related key names to the fields generated by the
+        schema's model converter for them.
+        """
+        key = (self.model, self.attribute or self.name)
+        key_fields = self._key_fields.get(key)
+        if key_fields is None:
+            converter = self.root.opts.model_converter
+            if isinstance(converter, type):
+                converter = converter(schema_cls=type(self.root))
+            key_fields = self._key_fields[key] = {
+                prop.key: converter.property2field(prop) for prop in self.related_keys
+            }
+        return key_fields
 
     @property
     def session(self):
@@ -82,21 +282,66 @@ class Related(fields.Field):
         return self.root.transient
 
     def _serialize(self, value, attr, obj):
-        ret = {prop.key: getattr(value, prop.key, None) for prop in self.related_keys}
-        return ret if len(ret) > 1 else list(ret.values())[0]
+        keys = self._resolve()[2]
+        if len(keys) == 1:
+            return getattr(value, keys[0], None)
+        return {key: getattr(value, key, None) for key in keys}
 
-    def _deserialize(self, value, *args, **kwargs):
-        """Deserialize a serialized value to a model instance.
+    def _get_statement(self):
+        key = (self.model, self.attribute or self.name)
+        statement = self._statements.get(key)
+        if statement is None:
+            related_model, _, key_names = self._resolve()
+            statement = self._statements[key] = sa.select(related_model).where(
+                *(
+                    getattr(related_model, name) == sa.bindparam(name)
+                    for name in key_names
+                )
+            )
+        return statement
 
-        If the parent schema is transient, create a new (transient) instance.
-        Otherwise, attempt to find an existing instance in the database.
-        :param value: The value to deserialize.
-        """
+    def _to_mapping(self, value):
         if not isinstance(value, dict):
             if len(self.related_keys) != 1:
                 keys = [prop.key for prop in self.related_keys]
                 raise self.make_error("invalid", value=value, keys=keys)
             value = {self.related_keys[0].key: value}
+        return value
+
+    def _deserialize(self, value, *args, related_instances=None, **kwargs):
+        """Deserialize a serialized value to a model instance.
+
+        If the parent schema is transient, create a new (transient) instance.
+        Otherwise, attempt to find an existing instance in the database.
+        :param value: The value to deserialize.
+        :param dict related_instances: Optional mapping of related key tuples to
+            instances, as returned by `_get_existing_instances`.
+        """
+        value = self._to_mapping(value)
+        if related_instances and not self.reference_only and not self.transient:
+            key_names = self._resolve()[2]
+            try:
+                result = related_instances.get(
+                    tuple(value.get(name) for name in key_names)
+                )
+            except TypeError:
+                result = None
+            if result is not None:
+                return result
+        if self.reference_only:
+            key_fields = self._get_key_fields()
+            values = {}
+            for local_key, related_key in self._get_foreign_keys():
+                try:
+                    if value.get(related_key) is None:
+                        raise ValidationError("Missing related key.")
+                    values[local_key] = key_fields[related_key].deserialize(
+                        value[related_key]
+                    )
+                except ValidationError as error:
+                    keys = [prop.key for prop in self.related_keys]
+                    raise self.make_error("invalid", value=value, keys=keys) from error
+            return ForeignKeyReference(values)
         if self.transient:
             return self.related_model(**value)
         try:
@@ -114,32 +359,141 @@ class Related(fields.Field):
         :param value: The serialized value to mapto an existing instance.
         :raises NoResultFound: if there is no matching record.
         """
+        if self.cache is not None:
+            cache_key = tuple(
+                (prop.key, value.get(prop.key)) for prop in self.related_keys
+            )
+            result = self.cache.get_instance(self.session, related_model, cache_key)
+            if result is not None:
+                return result
         if self.columns:
-            result = (
-                self.session.query(related_model)
-                .filter_by(
-                    **{prop.key: value.get(prop.key) for prop in self.related_keys}
-                )
-                .one()
+            params = {prop.key: value.get(prop.key) for prop in self.related_keys}
+            result = self.root._attach(
+                self.root.lookup_session.execute(
+                    self._get_statement(), params
+                ).scalar_one()
             )
         else:
             # Use a faster path if the related key is the primary key.
             lookup_values = [value.get(prop.key) for prop in self.related_keys]
             try:
-                result = self.session.get(related_model, lookup_values)
+                result = self.root._lookup_get(related_model, lookup_values)
             except TypeError as error:
                 keys = [prop.key for prop in self.related_keys]
                 raise self.make_error("invalid", value=value, keys=keys) from error
             if result is None:
                 raise NoResultFound
+        if self.cache is not None:
+            self.cache.add_instance(related_model, cache_key, result)
         return result
 
+    def _get_existing_instances(self, values):
+        """Retrieve the existing related instances of several serialized values
+        with one ``IN`` query.
+
+        Values that are invalid, not found or match several rows are left out,
+        so that they are looked up, and reported, one by one.
+
+        :param values: Serialized values.
+        :return: Mapping of related key tuples to instances.
+        """
+        if self.reference_only or self.transient or self.cache is not None:
+            return {}
+        related_model, _, key_names = self._resolve()
+        keys = set()
+        for value in values:
+            try:
+                value = self._to_mapping(value)
+                key = tuple(value.get(name) for name in key_names)
+                hash(key)
+            except (ValidationError, TypeError):
+                continue
+            if None not in key:
+                keys.add(key)
+        root = self.root
+        found = {}
+        if not self.columns:
+            # Related instances already in the session are used without a query
+            mapper = inspect(related_model)
+            for key in list(keys):
+                instance = root.session.identity_map.get(
+                    mapper.identity_key_from_primary_key(key)
+                )
+                if instance is not None:
+                    found[key] = instance
+                    keys.remove(key)
+        if len(keys) < 2:
+            return found
+        columns = [getattr(related_model, name) for name in key_names]
+        duplicates = set()
+        query = sa.select(related_model).where(key_in(columns, keys))
+        for instance in root.lookup_session.execute(query).scalars():
+            key = tuple(getattr(instance, name) for name in key_names)
+            if key in found:
+                duplicates.add(key)
+            found[key] = root._attach(instance)
+        for key in duplicates:
+            del found[key]
+        return found
+
+
+# Mapping of (nested schema id, identity key) -> serialized data, shared by
+# the `Nested` fields of a single top-level `dump` call.
+_dump_memo = contextvars.ContextVar("marshmallow_sqlalchemy_dump_memo")
+
+
+@contextlib.contextmanager
+def dump_memo():
+    """Share serialized nested objects between the memoizing `Nested` fields
+    for the duration of the outermost block.
+    """
+    if _dump_memo.get(None) is not None:
+        yield
+        return
+    token = _dump_memo.set({})
+    try:
+        yield
+    finally:
+        _dump_memo.reset(token)
+
 
 class Nested(fields.Nested):
-    """Nested field that inherits the session from its parent."""
+    """Nested field that inherits the session from its parent.
+
+    The session and transience of the enclosing `load` call are shared with
+    the nested schema through the load context, so the nested schema instance
+    is never modified.
+
+    :param bool memoize: Whether to serialize each distinct persistent object once
+        per `dump <marshmallow_sqlalchemy.SQLAlchemySchema.dump>` call and reuse the
+        result wherever it appears again, e.g. for many rows referring to the same
+        few related objects. The reused data are the same objects, so ``post_dump``
+        processors must not modify nested data in place.
+    """
+
+    def __init__(self, *args, memoize=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memoize = memoize
+
+    def _serialize(self, nested_obj, attr, obj, **kwargs):
+        memo = _dump_memo.get(None) if self.memoize else None
+        if memo is None:
+            return super()._serialize(nested_obj, attr, obj, **kwargs)
+        schema = self.schema
+        if nested_obj is None:
+            return None
+        if schema.many or self.many:
+            return [self._serialize_memoized(schema, item, memo) for item in nested_obj]
+        return self._serialize_memoized(schema, nested_obj, memo)
 
-    def _deserialize(self, *args, **kwargs):
-        if hasattr(self.schema, "session"):
-            self.schema.session = self.root.session
-            self.schema.transient = self.root.transient
-        return super()._deserialize(*args, **kwargs)
+    @staticmethod
+    def _serialize_memoized(schema, nested_obj, memo):
+        state = inspect(nested_obj, raiseerr=False)
+        identity_key = getattr(state, "identity_key", None)
+        if identity_key is None or state.modified:
+            return schema.dump(nested_obj, many=False)
+        key = (id(schema), identity_key)
+        data = memo.get(key)
+        if data is None:
+            data = memo[key] = schema.dump(nested_obj, many=False)
+        return data
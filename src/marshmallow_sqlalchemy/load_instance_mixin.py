@@ -6,10 +6,66 @@
     Users should not need to use this module directly.
 """
 
+import contextlib
+import contextvars
+from collections.abc import Mapping
+
 import marshmallow as ma
+import sqlalchemy as sa
+from marshmallow.utils import is_collection
 from sqlalchemy.orm.exc import ObjectDeletedError
 
-from .fields import get_primary_keys
+from .fields import (
+    expand_foreign_key_references,
+    get_primary_key_info,
+    key_getter,
+    key_in,
+)
+
+
+class _LoadContext:
+    """State of a single `load` or `validate` call.
+
+    Keeping per-call state out of the schema object allows a single schema
+    instance to be shared between threads and asyncio tasks. Nested schemas
+    inherit the session and transience of the enclosing call.
+    """
+
+    __slots__ = (
+        "schema",
+        "session",
+        "transient",
+        "load_instance",
+        "instance",
+        "identities",
+        "lookup_session",
+    )
+
+    def __init__(
+        self,
+        schema,
+        *,
+        session,
+        transient,
+        load_instance,
+        instance=None,
+        identities=None,
+        lookup_session=None,
+    ):
+        self.schema = schema
+        self.session = session
+        self.transient = transient
+        self.load_instance = load_instance
+        self.instance = instance
+        # Mapping of (model, lookup keys) -> {key tuple: instance or None},
+        # prefetched for the whole payload by the outermost `load` and shared
+        # with nested loads.
+        self.identities = identities
+        # Session used for read-only lookups, or `None` to use ``session``
+        self.lookup_session = lookup_session
+
+
+_load_context = contextvars.ContextVar("marshmallow_sqlalchemy_load_context")
 
 
 class LoadInstanceMixin:
@@ -19,18 +75,44 @@ class LoadInstanceMixin:
             self.sqla_session = getattr(meta, "sqla_session", None)
             self.load_instance = getattr(meta, "load_instance", False)
             self.transient = getattr(meta, "transient", False)
+            self.lookup_session = getattr(meta, "lookup_session", None)
+            self.lookup_bind = getattr(meta, "lookup_bind", None)
+            lookup_keys = getattr(meta, "instance_lookup_keys", None)
+            if isinstance(lookup_keys, str):
+                lookup_keys = (lookup_keys,)
+            self.instance_lookup_keys = tuple(lookup_keys) if lookup_keys else None
+            if self.lookup_session is not None and self.lookup_bind is not None:
+                raise ValueError(
+                    "Cannot set both `lookup_session` and `lookup_bind` options."
+                )
 
     class Schema:
         @property
         def session(self):
+            context = _load_context.get(None)
+            if context is not None:
+                return context.session
             return self._session or self.opts.sqla_session
 
         @session.setter
         def session(self, session):
             self._session = session
 
+        @property
+        def lookup_session(self):
+            """Session used for read-only lookups of existing rows, e.g. on a read
+            replica. Defaults to `session`.
+            """
+            context = _load_context.get(None)
+            if context is not None:
+                return context.lookup_session or context.session
+            return self.opts.lookup_session or self.session
+
         @property
         def transient(self):
+            context = _load_context.get(None)
+            if context is not None:
+                return context.transient
             if self._transient is not None:
                 return self._transient
             return self.opts.transient
@@ -47,34 +129,96 @@ class LoadInstanceMixin:
             super().__init__(*args, **kwargs)
 
         def get_instance(self, data):
-            """Retrieve an existing record by primary key(s). If the schema instance
+            """Retrieve an existing record by primary key(s), or by the
+            ``instance_lookup_keys`` option if it is set. If the schema instance
             is transient, return None.
 
             :param data: Serialized data to inform lookup.
             """
             if self.transient:
                 return None
-            props = get_primary_keys(self.opts.model)
-            filters = {prop.key: data.get(prop.key) for prop in props}
-            if None not in filters.values():
+            model = self.opts.model
+            lookup_keys = self._get_lookup_keys()
+            key = tuple([data.get(lookup_key) for lookup_key in lookup_keys])
+            if None not in key:
+                context = _load_context.get(None)
+                prefetched = (
+                    context.identities.get((model, lookup_keys))
+                    if context is not None and context.identities
+                    else None
+                )
+                if prefetched is not None and key in prefetched:
+                    return prefetched[key]
+                if self.opts.instance_lookup_keys:
+                    query = sa.select(model).filter_by(**dict(zip(lookup_keys, key)))
+                    return self._attach(
+                        self.lookup_session.execute(query).scalar_one_or_none()
+                    )
                 try:
-                    return self.session.get(self.opts.model, filters)
+                    return self._lookup_get(model, key)
                 except ObjectDeletedError:
                     return None
             return None
 
+        def _get_lookup_keys(self):
+            """Return the attribute names that identify existing instances."""
+            return (
+                self.opts.instance_lookup_keys
+                or get_primary_key_info(self.opts.model).keys
+            )
+
+        def _lookup_get(self, model, key):
+            """Return the instance of ``model`` with primary key ``key`` in the
+            writing session, or `None`.
+
+            Instances already in the writing session are returned without a query.
+            Others are loaded with the lookup session and merged into the writing
+            session.
+            """
+            session = self.session
+            lookup_session = self.lookup_session
+            if lookup_session is session:
+                return session.get(model, key)
+            identity_key = sa.inspect(model).identity_key_from_primary_key(key)
+            instance = session.identity_map.get(identity_key)
+            if instance is not None:
+                return instance
+            return self._attach(lookup_session.get(model, key))
+
+        def _attach(self, instance):
+            """Return the writing session's copy of an ``instance`` loaded with
+            the lookup session.
+
+            Instances already in the writing session are kept as-is, so that their
+            pending changes are not overwritten by the values read.
+            """
+            session = self.session
+            if instance is None or self.lookup_session is session:
+                return instance
+            existing = session.identity_map.get(sa.inspect(instance).identity_key)
+            if existing is not None:
+                return existing
+            return session.merge(instance, load=False)
+
         @ma.post_load
         def make_instance(self, data, **kwargs):
             """Deserialize data to an instance of the model if self.load_instance is True.
 
             Update an existing row if specified in `self.instance` or loaded by primary
-            key(s) in the data; else create a new row.
+            key(s) in the data; else create a new row. `ForeignKeyReference` values
+            are replaced by the foreign key values they hold.
 
             :param data: Data to deserialize.
             """
-            if not self._load_instance:
+            expand_foreign_key_references(data)
+            context = _load_context.get(None)
+            if context is not None and context.schema is self:
+                load_instance, instance = context.load_instance, context.instance
+            else:
+                load_instance, instance = self._load_instance, self.instance
+            if not load_instance:
                 return data
-            instance = self.instance or self.get_instance(data)
+            instance = instance or self.get_instance(data)
             if instance is not None:
                 for key, value in data.items():
                     setattr(instance, key, value)
@@ -85,28 +229,208 @@ class LoadInstanceMixin:
                 setattr(instance, attr, value)
             return instance
 
-        def load(self, data, *, session=None, instance=None, transient=False, **kwargs):
+        def load(
+            self,
+            data,
+            *,
+            session=None,
+            instance=None,
+            transient=False,
+            load_instance=None,
+            **kwargs,
+        ):
             """Deserialize data to internal representation.
 
             :param session: Optional SQLAlchemy session.
-            :param instance: Optional existing instance to modify.
+            :param instance: Optional existing instance to modify. Defaults to the
+                instance passed to the constructor.
             :param transient: Optional switch to allow transient instantiation.
+            :param load_instance: Optional override of the schema's ``load_instance``
+                setting for this call.
             """
-            self._session = session or self._session
-            self._transient = transient or self._transient
-            if self._load_instance and not (self.transient or self.session):
-                raise ValueError("Deserialization requires a session")
-            self.instance = instance or self.instance
-            try:
+            instance = instance or self.instance
+            with self._load_context(
+                session=session,
+                transient=transient,
+                load_instance=load_instance,
+                instance=instance,
+            ) as context:
+                if context.load_instance and not (context.transient or context.session):
+                    raise ValueError("Deserialization requires a session")
+                if (
+                    context.identities is None
+                    and not context.transient
+                    and context.session
+                ):
+                    many = kwargs.get("many")
+                    context.identities = self._prefetch_instances(
+                        data, many=self.many if many is None else many
+                    )
                 return super().load(data, **kwargs)
-            finally:
-                self.instance = None
 
         def validate(self, data, *, session=None, **kwargs):
-            self._session = session or self._session
-            if not (self.transient or self.session):
-                raise ValueError("Validation requires a session")
-            return super().validate(data, **kwargs)
+            with self._load_context(session=session) as context:
+                if not (context.transient or context.session):
+                    raise ValueError("Validation requires a session")
+                return super().validate(data, **kwargs)
+
+        @contextlib.contextmanager
+        def _load_context(
+            self, *, session=None, transient=False, load_instance=None, instance=None
+        ):
+            """Make the state of a `load` or `validate` call available to this
+            schema, its fields and nested schemas for the duration of the call.
+            """
+            outer = _load_context.get(None)
+            owned_lookup_session = None
+            if outer is not None:
+                session = session or outer.session
+                lookup_session = outer.lookup_session
+            else:
+                lookup_session = self.opts.lookup_session
+                if lookup_session is None and self.opts.lookup_bind is not None:
+                    lookup_session = owned_lookup_session = sa.orm.Session(
+                        bind=self.opts.lookup_bind
+                    )
+            if not transient:
+                if outer is not None:
+                    transient = outer.transient
+                elif self._transient is not None:
+                    transient = self._transient
+                else:
+                    transient = self.opts.transient
+            context = _LoadContext(
+                self,
+                session=session or self._session or self.opts.sqla_session,
+                transient=transient,
+                load_instance=(
+                    self._load_instance if load_instance is None else load_instance
+                ),
+                instance=instance,
+                identities=outer.identities if outer is not None else None,
+                lookup_session=lookup_session,
+            )
+            token = _load_context.set(context)
+            try:
+                yield context
+            finally:
+                _load_context.reset(token)
+                if owned_lookup_session is not None:
+                    owned_lookup_session.close()
+
+        def _prefetch_instances(self, data, *, many):
+            """Load the existing instances for all primary keys in ``data``, including
+            those of nested schemas, with one query per model.
+
+            Keys are read from the raw input, before ``pre_load`` processors run;
+            instances whose key is not prefetched are still looked up individually.
+
+            :param data: Raw data passed to `load`.
+            :param bool many: Whether ``data`` is a collection.
+            :return: Mapping of (model, lookup keys) -> {key tuple: instance or None}.
+            """
+            context = _load_context.get()
+            keys_by_model = {}
+            self._collect_primary_keys(
+                data,
+                many=many,
+                load_instance=context.load_instance,
+                keys_by_model=keys_by_model,
+            )
+            session = context.session
+            lookup_session = context.lookup_session or session
+            identities = {}
+            for (model, lookup_keys), keys in keys_by_model.items():
+                info = get_primary_key_info(model)
+                if lookup_keys == info.keys:
+                    mapper = sa.inspect(model)
+                    # Instances already in the identity map are retrieved by
+                    # `Session.get` without emitting a query.
+                    keys = [
+                        key
+                        for key in keys
+                        if mapper.identity_key_from_primary_key(key)
+                        not in session.identity_map
+                    ]
+                    get_key = info.get_key
+                else:
+                    keys = list(keys)
+                    get_key = key_getter(lookup_keys)
+                if len(keys) < 2:
+                    continue
+                columns = [getattr(model, key) for key in lookup_keys]
+                found = dict.fromkeys(keys)
+                query = sa.select(model).where(key_in(columns, keys))
+                for instance in lookup_session.execute(query).scalars():
+                    found[get_key(instance)] = self._attach(instance)
+                identities[(model, lookup_keys)] = found
+            return identities
+
+        def _collect_primary_keys(self, data, *, many, load_instance, keys_by_model):
+            items = data if many else [data]
+            if not is_collection(items):
+                return
+            model = self.opts.model
+            pk_fields = []
+            if load_instance and model is not None:
+                lookup_keys = self._get_lookup_keys()
+                pk_fields = [self._get_load_field(key) for key in lookup_keys]
+                if None in pk_fields:
+                    pk_fields = []
+            nested_fields = []
+            for field_name, field_obj in self.load_fields.items():
+                data_key = (
+                    field_obj.data_key if field_obj.data_key is not None else field_name
+                )
+                if isinstance(field_obj, ma.fields.Nested):
+                    nested_fields.append((data_key, field_obj, False))
+                elif isinstance(field_obj, ma.fields.List) and isinstance(
+                    field_obj.inner, ma.fields.Nested
+                ):
+                    nested_fields.append((data_key, field_obj.inner, True))
+            for item in items:
+                if not isinstance(item, Mapping):
+                    continue
+                if pk_fields:
+                    key = []
+                    for data_key, field_obj in pk_fields:
+                        try:
+                            value = field_obj.deserialize(
+                                item.get(data_key, ma.missing), data_key, item
+                            )
+                        except ma.ValidationError:
+                            break
+                        if value is None or value is ma.missing:
+                            break
+                        key.append(value)
+                    else:
+                        keys_by_model.setdefault((model, lookup_keys), set()).add(
+                            tuple(key)
+                        )
+                for data_key, field_obj, is_list in nested_fields:
+                    value = item.get(data_key)
+                    schema = field_obj.schema
+                    if value is None or not isinstance(
+                        schema, LoadInstanceMixin.Schema
+                    ):
+                        continue
+                    schema._collect_primary_keys(
+                        value,
+                        many=is_list or schema.many or field_obj.many,
+                        load_instance=schema._load_instance,
+                        keys_by_model=keys_by_model,
+                    )
+
+        def _get_load_field(self, attribute):
+            for field_name, field_obj in self.load_fields.items():
+                if (field_obj.attribute or field_name) == attribute:
+                    data_key = (
+                        field_obj.data_key
+                        if field_obj.data_key is not None
+                        else field_name
+                    )
+                    return data_key, field_obj
+            return None
 
         def _split_model_kwargs_association(self, data):
             """Split serialized attrs to ensure association proxies are passed separately.
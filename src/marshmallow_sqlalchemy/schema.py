@@ -1,11 +1,121 @@
+import copy
+import gc
+import itertools
+import threading
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
 import sqlalchemy as sa
-from marshmallow.fields import Field
+from marshmallow import (
+    EXCLUDE,
+    INCLUDE,
+    RAISE,
+    ValidationError,
+    class_registry,
+    missing,
+)
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.exceptions import RegistryError
+from marshmallow.fields import Field, List, Nested
 from marshmallow.schema import Schema, SchemaMeta, SchemaOpts
+from marshmallow.utils import is_collection, set_value
+from sqlalchemy.ext.associationproxy import AssociationProxy
 from sqlalchemy.ext.declarative import DeclarativeMeta
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy.orm.exc import StaleDataError
 
+from . import encoders
+from .cache import _LRUCache
 from .convert import ModelConverter
-from .exceptions import IncorrectSchemaTypeError
+from .exceptions import IncorrectSchemaTypeError, UnloadedAttributeError
+from .fields import (
+    Related,
+    dump_memo,
+    expand_foreign_key_references,
+    get_primary_key_info,
+)
 from .load_instance_mixin import LoadInstanceMixin
+from .validation_mixin import ValidationMixin
+
+# Column values of these types are deserialized once per distinct value
+# by `SQLAlchemySchema.load_columns`.
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _find_unloaded_attribute(obj, names):
+    """Return the state and key of the first unloaded attribute that reading the
+    attribute path ``names`` of ``obj`` would load, or `None`.
+
+    Synonyms and association proxies are followed to the attributes they read, and
+    loaded relationships to the attributes of the related instances.
+    """
+    names = list(names)
+    while names:
+        state = sa.inspect(obj, raiseerr=False)
+        if state is None or not state.has_identity:
+            return None
+        mapper = state.mapper
+        name = names.pop(0)
+        if name in mapper.synonyms:
+            names.insert(0, mapper.synonyms[name].name)
+            continue
+        descriptor = mapper.all_orm_descriptors.get(name)
+        if isinstance(descriptor, AssociationProxy):
+            names[:0] = [descriptor.target_collection, descriptor.value_attr]
+            continue
+        if name not in state.manager:
+            return None
+        if name not in state.dict:
+            return state, name
+        obj = state.dict[name]
+        if (
+            names
+            and name in mapper.relationships
+            and mapper.relationships[name].uselist
+        ):
+            if isinstance(obj, Mapping):
+                obj = obj.values()
+            for item in obj:
+                unloaded = _find_unloaded_attribute(item, names)
+                if unloaded is not None:
+                    return unloaded
+            return None
+    return None
+
+
+def _get_nested_schema_class(schema_class, field_obj):
+    """Return the `SQLAlchemySchema` class nested by ``field_obj``, a field declared
+    on ``schema_class``, or `None`.
+    """
+    nested = field_obj.nested
+    if callable(nested) and not isinstance(nested, type):
+        # Callables return a schema class or instance
+        try:
+            nested = nested()
+        except Exception:
+            return None
+    if isinstance(nested, str):
+        if nested == "self":
+            nested = schema_class
+        else:
+            try:
+                nested = class_registry.get_class(nested)
+            except RegistryError:
+                return None
+    if not isinstance(nested, type):
+        nested = type(nested)
+    if issubclass(nested, SQLAlchemySchema):
+        return nested
+    return None
+
+
+def _has_processors(schema, tag):
+    # Older marshmallow versions key processors by ``(tag, pass_many)`` and
+    # provide `Schema._has_processors`; newer versions key them by tag.
+    has_processors = getattr(schema, "_has_processors", None)
+    if has_processors is not None:
+        return has_processors(tag)
+    return bool(schema._hooks[tag])
 
 
 # This isn't really a field; it's a placeholder for the metaclass.
@@ -25,11 +135,20 @@ class SQLAlchemyAutoField(Field):
     def create_field(self, schema_opts, column_name, converter):
         model = self.model or schema_opts.model
         if model:
-            return converter.field_for(model, column_name, **self.field_kwargs)
+            return converter.field_for(
+                model,
+                column_name,
+                trust_native_types=schema_opts.trust_native_types,
+                **self.field_kwargs,
+            )
         else:
             table = self.table if self.table is not None else schema_opts.table
             column = getattr(table.columns, column_name)
-            return converter.column2field(column, **self.field_kwargs)
+            return converter.column2field(
+                column,
+                trust_native_types=schema_opts.trust_native_types,
+                **self.field_kwargs,
+            )
 
     # This field should never be bound to a schema.
     # If this method is called, it's probably because the schema is not a SQLAlchemySchema.
@@ -39,7 +158,7 @@ class SQLAlchemyAutoField(Field):
         )
 
 
-class SQLAlchemySchemaOpts(LoadInstanceMixin.Opts, SchemaOpts):
+class SQLAlchemySchemaOpts(LoadInstanceMixin.Opts, ValidationMixin.Opts, SchemaOpts):
     """Options class for `SQLAlchemySchema`.
     Adds the following options:
 
@@ -50,7 +169,51 @@ class SQLAlchemySchemaOpts(LoadInstanceMixin.Opts, SchemaOpts):
         This is only needed when ``load_instance`` is `True`. You can also pass a session to the Schema's `load` method.
     - ``transient``: Whether to load model instances in a transient state (effectively ignoring the session).
         Only relevant when ``load_instance`` is `True`.
+    - ``instance_lookup_keys``: Names of the attributes, e.g. a natural key backed by
+        a unique index, used instead of the primary key to match loaded data to
+        existing instances when ``load_instance`` is `True`.
+    - ``lookup_session``: Optional SQLAlchemy session, e.g. bound to a read replica,
+        used for the read-only lookups of existing rows made while loading: instances
+        by primary key, `Related` values and the ``validate_foreign_keys`` and
+        ``validate_unique`` checks. Instances found are merged into the loading session
+        unless it already holds them. Defaults to the loading session.
+    - ``lookup_bind``: Engine or connection to create a ``lookup_session`` from for
+        each `load` call (mutually exclusive with ``lookup_session``).
     - ``model_converter``: `ModelConverter` class to use for converting the SQLAlchemy model to marshmallow fields.
+        A `ModelConverter` instance may also be passed, to share it between schemas.
+    - ``json_encoder``: Callable that encodes serialized data to JSON `bytes`, used by
+        `SQLAlchemySchema.dump_json`. Defaults to orjson if it is installed, else `json`.
+    - ``dump_cache``: Optional `DumpCache <marshmallow_sqlalchemy.cache.DumpCache>`
+        of the serialized representations of persistent instances.
+    - ``share_fields``: Whether schema instances share the fields generated from
+        columns instead of copying them; defaults to `False`. Fields are still copied
+        when ``only``, ``exclude``, ``load_only``, ``dump_only`` or ``context`` is passed
+        to the constructor. Do not enable it if ``on_bind_field`` modifies fields.
+    - ``projection_cache_size``: Number of field sets, one per combination of ``only``,
+        ``exclude``, ``load_only``, ``dump_only`` and ``partial`` constructor arguments,
+        to cache for reuse by new schema instances; defaults to ``0`` (disabled).
+        Instances created with the same arguments then share the bound fields
+        generated from columns, with the same caveats as ``share_fields``.
+    - ``validate_foreign_keys``: Whether to check that the rows referenced by loaded
+        foreign key values exist, with one query per foreign key constraint for the
+        whole payload; defaults to `False`. Requires a session.
+    - ``validate_unique``: Whether to check the values of unique constraints and unique
+        indexes for duplicates within the payload and, unless the schema is transient,
+        in the database, with one query per constraint; defaults to `False`.
+    - ``trust_native_types``: Whether fields generated from columns load input values
+        whose type is exactly the column's ``python_type`` (e.g. `datetime.datetime`
+        or `uuid.UUID`) as-is instead of deserializing them; defaults to `False`.
+        Null handling and validators such as ``Length`` and ``OneOf`` still apply,
+        and numbers are always deserialized, so that special values are rejected
+        and decimals are rounded to the column's scale.
+    - ``dump_unloaded``: How to dump the attributes of persistent or detached
+        instances that are not loaded (deferred columns, expired attributes and
+        relationships that were not eager loaded), as listed by
+        ``sqlalchemy.inspect(obj).unloaded``. If `None` (the default), they are
+        loaded. If ``EXCLUDE``, they are left out of the output; if ``RAISE``,
+        an `UnloadedAttributeError` is raised. Synonyms, association proxies and
+        dotted ``attribute`` paths are followed to the attributes they read, but
+        the attributes read by ``Method`` and ``Function`` fields are not checked.
     """
 
     def __init__(self, meta, *args, **kwargs):
@@ -61,6 +224,17 @@ class SQLAlchemySchemaOpts(LoadInstanceMixin.Opts, SchemaOpts):
         if self.model is not None and self.table is not None:
             raise ValueError("Cannot set both `model` and `table` options.")
         self.model_converter = getattr(meta, "model_converter", ModelConverter)
+        self.json_encoder = getattr(meta, "json_encoder", encoders.encode)
+        self.dump_cache = getattr(meta, "dump_cache", None)
+        self.share_fields = getattr(meta, "share_fields", False)
+        self.projection_cache_size = getattr(meta, "projection_cache_size", 0)
+        self.trust_native_types = getattr(meta, "trust_native_types", False)
+        self.dump_unloaded = getattr(meta, "dump_unloaded", None)
+        if self.dump_unloaded not in (None, EXCLUDE, RAISE):
+            raise ValueError(
+                "`dump_unloaded` must be one of None, EXCLUDE or RAISE, "
+                f"not {self.dump_unloaded!r}."
+            )
 
 
 class SQLAlchemyAutoSchemaOpts(SQLAlchemySchemaOpts):
@@ -79,17 +253,49 @@ class SQLAlchemyAutoSchemaOpts(SQLAlchemySchemaOpts):
             raise ValueError("Cannot set `table` and `include_relationships = True`.")
 
 
+def _freeze_option(value):
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    return frozenset(value)
+
+
+class _SharedFieldsDict(dict):
+    """Declared fields whose deep copies share the fields named in ``shared``."""
+
+    def __init__(self, fields, shared):
+        super().__init__(fields)
+        self.shared = shared
+
+    def __deepcopy__(self, memo):
+        return {
+            name: field if name in self.shared else copy.deepcopy(field, memo)
+            for name, field in self.items()
+        }
+
+
 class SQLAlchemySchemaMeta(SchemaMeta):
     @classmethod
     def get_declared_fields(mcs, klass, cls_fields, inherited_fields, dict_cls):
         opts = klass.opts
         Converter = opts.model_converter
-        converter = Converter(schema_cls=klass)
+        if isinstance(Converter, ModelConverter):
+            converter = Converter
+        else:
+            converter = Converter(schema_cls=klass)
         fields = super().get_declared_fields(
             klass, cls_fields, inherited_fields, dict_cls
         )
-        fields.update(mcs.get_declared_sqla_fields(fields, converter, opts, dict_cls))
-        fields.update(mcs.get_auto_fields(fields, converter, opts, dict_cls))
+        sqla_fields = mcs.get_declared_sqla_fields(fields, converter, opts, dict_cls)
+        fields.update(sqla_fields)
+        auto_fields = mcs.get_auto_fields(fields, converter, opts, dict_cls)
+        fields.update(auto_fields)
+        # Names of the fields generated by the converter, which may be shared
+        # between schema instances (see the ``share_fields`` option).
+        klass._converted_field_names = frozenset(
+            name
+            for name, field in {**sqla_fields, **auto_fields}.items()
+            if field is not None and field is fields.get(name)
+        )
         return fields
 
     @classmethod
@@ -123,6 +329,7 @@ class SQLAlchemyAutoSchemaMeta(SQLAlchemySchemaMeta):
                     include_fk=opts.include_fk,
                     base_fields=base_fields,
                     dict_cls=dict_cls,
+                    trust_native_types=opts.trust_native_types,
                 )
             )
         elif opts.model is not None:
@@ -135,13 +342,17 @@ class SQLAlchemyAutoSchemaMeta(SQLAlchemySchemaMeta):
                     include_relationships=opts.include_relationships,
                     base_fields=base_fields,
                     dict_cls=dict_cls,
+                    trust_native_types=opts.trust_native_types,
                 )
             )
         return fields
 
 
 class SQLAlchemySchema(
-    LoadInstanceMixin.Schema, Schema, metaclass=SQLAlchemySchemaMeta
+    LoadInstanceMixin.Schema,
+    ValidationMixin.Schema,
+    Schema,
+    metaclass=SQLAlchemySchemaMeta,
 ):
     """Schema for a SQLAlchemy model or table.
     Use together with `auto_field` to generate fields from columns.
@@ -164,6 +375,456 @@ class SQLAlchemySchema(
 
     OPTIONS_CLASS = SQLAlchemySchemaOpts
 
+    def __init__(self, *args, **kwargs):
+        projection_key = projection = None
+        if self.opts.projection_cache_size and not kwargs.get("context"):
+            projection_key = tuple(
+                _freeze_option(kwargs.get(key))
+                for key in ("only", "exclude", "load_only", "dump_only", "partial")
+            )
+            projection = self._get_projection_cache().get(projection_key)
+        if projection is not None:
+            self._declared_fields = _SharedFieldsDict(
+                {**self._declared_fields, **projection}, frozenset(projection)
+            )
+        elif self.opts.share_fields and not any(
+            kwargs.get(key)
+            for key in ("only", "exclude", "load_only", "dump_only", "context")
+        ):
+            self._declared_fields = self._get_shared_declared_fields()
+        super().__init__(*args, **kwargs)
+        if projection_key is not None and projection is None:
+            # Only the fields generated by the converter are reused, since the
+            # others may depend on the schema instance they are bound to
+            self._get_projection_cache().set(
+                projection_key,
+                {
+                    name: field_obj
+                    for name, field_obj in self.declared_fields.items()
+                    if name in self._converted_field_names
+                    and not isinstance(field_obj, (Related, List))
+                },
+            )
+
+    @classmethod
+    def _get_projection_cache(cls):
+        projections = cls.__dict__.get("_projection_cache")
+        if projections is None:
+            projections = cls._projection_cache = _LRUCache(
+                cls.opts.projection_cache_size
+            )
+        return projections
+
+    @classmethod
+    def _get_shared_declared_fields(cls):
+        """Return the declared fields of this class, with the fields generated by
+        the converter replaced by prototypes that are shared between instances.
+
+        Container and `Related` fields are not shared, since they depend on the
+        schema instance they are bound to.
+        """
+        shared_fields = cls.__dict__.get("_shared_declared_fields")
+        if shared_fields is None:
+            fields = dict(cls._declared_fields)
+            shared = set()
+            for name in cls._converted_field_names:
+                field_obj = fields[name]
+                if not isinstance(field_obj, (Related, List)):
+                    fields[name] = copy.deepcopy(field_obj)
+                    shared.add(name)
+            shared_fields = cls._shared_declared_fields = _SharedFieldsDict(
+                fields, frozenset(shared)
+            )
+        return shared_fields
+
+    @classmethod
+    def warm_up(cls):
+        """Resolve everything that is otherwise computed on first use: mapper
+        configuration, the related model and keys of `Related` fields, the shared
+        fields of ``share_fields`` schemas, and the classes of nested schemas, which
+        are warmed up recursively. Schemas are not instantiated.
+
+        Call it at import time or before forking worker processes, so that the
+        first request in each worker does not pay these costs. See also `warm_up_all`.
+        """
+        cls._warm_up(set())
+
+    @classmethod
+    def _warm_up(cls, seen):
+        # Fields are resolved from the declared fields, without instantiating the
+        # schema, whose constructor may require arguments.
+        if cls in seen:
+            return
+        seen.add(cls)
+        configure_mappers()
+        if cls.opts.share_fields:
+            cls._get_shared_declared_fields()
+        for field_name, field_obj in cls._declared_fields.items():
+            if isinstance(field_obj, List):
+                field_obj = field_obj.inner
+            if isinstance(field_obj, Related) and cls.opts.model is not None:
+                field_obj._resolve_for(
+                    cls.opts.model, field_obj.attribute or field_name
+                )
+            elif isinstance(field_obj, Nested):
+                nested_class = _get_nested_schema_class(cls, field_obj)
+                if nested_class is not None:
+                    nested_class._warm_up(seen)
+
+    def get_attribute(self, obj, attr, default):
+        """Return the value of ``attr`` of ``obj``. With the ``dump_unloaded``
+        option, unloaded attributes of instances with an identity are not loaded.
+        """
+        mode = self.opts.dump_unloaded
+        if mode is not None and isinstance(attr, str):
+            unloaded = _find_unloaded_attribute(obj, attr.split("."))
+            if unloaded is not None:
+                if mode == RAISE:
+                    state, key = unloaded
+                    raise UnloadedAttributeError(
+                        f"Attribute {key!r} of {state.class_.__name__} "
+                        "is not loaded."
+                    )
+                return missing
+        return super().get_attribute(obj, attr, default)
+
+    def dump_json(self, obj, *, many=None):
+        """Serialize an object to JSON `bytes`.
+
+        Unlike `dumps`, values of fields generated for natively encodable column
+        types (e.g. strings, numbers, datetimes and UUIDs) are passed straight to the
+        encoder without being formatted by their field first. Enums are
+        serialized by name (or by value if ``by_value=True``) and decimals as strings.
+        Other fields are serialized as with `dump`.
+
+        The encoder is set by the ``json_encoder`` option; by default, orjson is
+        used if it is installed (``pip install marshmallow-sqlalchemy[orjson]``).
+
+        :param obj: The object to serialize.
+        :param many: Whether to serialize `obj` as a collection. If `None`, the value
+            for `self.many` is used.
+        :return: The serialized data as JSON `bytes`.
+        """
+        many = self.many if many is None else bool(many)
+        if _has_processors(self, PRE_DUMP) or _has_processors(self, POST_DUMP):
+            data = self.dump(obj, many=many)
+        else:
+            with dump_memo():
+                data = self._serialize_json(obj, many=many)
+        return self.opts.json_encoder(data)
+
+    def dump(self, obj, *, many=None):
+        with dump_memo():
+            return super().dump(obj, many=many)
+
+    def _serialize(self, obj, *, many=False):
+        if many or self.opts.dump_cache is None:
+            return super()._serialize(obj, many=many)
+        return self._serialize_cached(obj, super()._serialize, tag="dump")
+
+    def _serialize_json(self, obj, *, many=False):
+        if many and obj is not None:
+            return [self._serialize_json(item) for item in obj]
+        if self.opts.dump_cache is not None:
+            return self._serialize_cached(obj, self._serialize_json_item, tag="json")
+        return self._serialize_json_item(obj)
+
+    def _serialize_cached(self, obj, serialize, *, tag):
+        cache = self.opts.dump_cache
+        key = cache.get_key(self, obj, tag=tag)
+        if key is None:
+            return serialize(obj)
+        data = cache.get_data(key)
+        if data is None:
+            data = serialize(obj)
+            cache.add_data(key, data)
+        # Copy, so that ``post_dump`` processors cannot modify the cached data
+        return self.dict_class(data)
+
+    def _serialize_json_item(self, obj):
+        plan = self.__dict__.get("_json_plan")
+        if plan is None:
+            plan = self._json_plan = [
+                (
+                    attr_name,
+                    field_obj.data_key if field_obj.data_key is not None else attr_name,
+                    field_obj,
+                    encoders.get_fast_serializer(field_obj),
+                )
+                for attr_name, field_obj in self.dump_fields.items()
+            ]
+        ret = self.dict_class()
+        for attr_name, key, field_obj, fast_serializer in plan:
+            if fast_serializer is None:
+                value = field_obj.serialize(attr_name, obj, accessor=self.get_attribute)
+            else:
+                value = field_obj.get_value(obj, attr_name, accessor=self.get_attribute)
+                if value is missing:
+                    # Let the field apply its `dump_default`
+                    value = field_obj.serialize(
+                        attr_name, obj, accessor=self.get_attribute
+                    )
+                elif value is not None:
+                    types, function = fast_serializer
+                    if type(value) in types:
+                        value = function(value)
+                    else:
+                        value = field_obj._serialize(value, attr_name, obj)
+            if value is missing:
+                continue
+            ret[key] = value
+        return ret
+
+    def load_columns(self, data, *, partial=None, unknown=None):
+        """Deserialize column-oriented data, e.g. ``{"name": ["a", "b"], "age": [1, 2]}``,
+        to a list of row dictionaries suitable for ``executemany``.
+
+        Each column is deserialized and validated in a single pass. Scalar values
+        (strings, numbers, booleans and `None`) are deserialized once per distinct
+        value within a column, so that low-cardinality columns (e.g. enums and status
+        codes) are validated once per value rather than once per cell.
+
+        Unlike `load`, schema-level processors and validators (``pre_load``,
+        ``post_load``, ``validates`` and ``validates_schema``) are not invoked
+        and model instances are never created.
+
+        :param data: Mapping of data keys to equally sized sequences of values.
+        :param partial: Whether to ignore missing columns. If its value is an iterable,
+            only missing columns listed in that iterable will be ignored.
+        :param unknown: Whether to exclude, include, or raise an error for unknown
+            columns. If `None`, the value for `self.unknown` is used.
+        :return: List of deserialized rows.
+        :raises ValidationError: If any value is invalid. Errors are keyed by row index.
+        """
+        if partial is None:
+            partial = self.partial
+        unknown = self.unknown if unknown is None else unknown
+        for key, values in data.items():
+            # Columns are indexed by row, so iterators are not accepted
+            if not isinstance(values, Sequence) or isinstance(values, (str, bytes)):
+                raise ValidationError({key: [self.error_messages["type"]]})
+        lengths = {len(values) for values in data.values()}
+        if len(lengths) > 1:
+            raise ValidationError("Columns must all have the same length.")
+        num_rows = lengths.pop() if lengths else 0
+        rows = [self.dict_class() for _ in range(num_rows)]
+        errors = {}
+        data_keys = set()
+        for attr_name, field_obj in self.load_fields.items():
+            data_key = (
+                field_obj.data_key if field_obj.data_key is not None else attr_name
+            )
+            data_keys.add(data_key)
+            values = data.get(data_key, missing)
+            if values is missing:
+                if partial is True or (is_collection(partial) and attr_name in partial):
+                    continue
+                values = [missing] * num_rows
+            key = field_obj.attribute or attr_name
+            memo = {}
+            for index, raw_value in enumerate(values):
+                memo_key = (
+                    (raw_value.__class__, raw_value)
+                    if isinstance(raw_value, _SCALAR_TYPES)
+                    else None
+                )
+                if memo_key is not None and memo_key in memo:
+                    value, messages = memo[memo_key]
+                else:
+                    try:
+                        value = field_obj.deserialize(raw_value, data_key, data)
+                        messages = None
+                    except ValidationError as error:
+                        value, messages = missing, error.messages
+                    if memo_key is not None:
+                        memo[memo_key] = (value, messages)
+                if messages is not None:
+                    errors.setdefault(index, {})[data_key] = messages
+                elif value is not missing:
+                    set_value(rows[index], key, value)
+        if unknown != EXCLUDE:
+            for data_key in set(data) - data_keys:
+                for index, value in enumerate(data[data_key]):
+                    if unknown == INCLUDE:
+                        rows[index][data_key] = value
+                    elif unknown == RAISE:
+                        errors.setdefault(index, {})[data_key] = [
+                            self.error_messages["unknown"]
+                        ]
+        for row in rows:
+            expand_foreign_key_references(row)
+        if errors:
+            raise ValidationError(errors, data=data, valid_data=rows)
+        return rows
+
+    def ingest(self, records, session, *, batch_size=1000, on_error=None):
+        """Load model instances from an iterable of records, e.g. the lines of an
+        NDJSON file decoded with ``map(json.loads, file)``, in batches of
+        ``batch_size`` records.
+
+        Each batch is loaded with ``load(many=True)``, so existing instances are
+        retrieved with one query per model. The instances are then added to
+        ``session``, the session is committed and all instances are expunged from it,
+        so that memory use is bounded by the batch size rather than the input size.
+
+        :param records: Iterable of records to load. It is consumed lazily.
+        :param session: SQLAlchemy session to load and commit instances with.
+        :param int batch_size: Number of records per batch.
+        :param on_error: Callable invoked as ``on_error(error, batch, offset)`` with
+            the `ValidationError` of a batch, the batch's records and the position
+            of its first record in ``records``. The valid records of the batch are
+            still loaded; if loading them fails again, ``on_error`` is invoked a
+            second time for the batch and none of its records are loaded. If `None`,
+            the error is raised.
+        :return: Number of instances committed.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        records = iter(records)
+        offset = count = 0
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return count
+            instances = self._load_batch(batch, session, offset, on_error)
+            if instances:
+                session.add_all(instances)
+                try:
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+                count += len(instances)
+            session.expunge_all()
+            offset += len(batch)
+
+    def _load_batch(self, batch, session, offset, on_error):
+        try:
+            return self.load(batch, many=True, session=session, load_instance=True)
+        except ValidationError as error:
+            if on_error is None:
+                raise
+            on_error(error, batch, offset)
+            messages = error.messages
+            if not isinstance(messages, dict) or not all(
+                isinstance(index, int) for index in messages
+            ):
+                # Schema-level errors apply to the whole batch
+                return []
+            positions = [index for index in range(len(batch)) if index not in messages]
+        if not positions:
+            return []
+        valid = [batch[index] for index in positions]
+        try:
+            return self.load(valid, many=True, session=session, load_instance=True)
+        except ValidationError as error:
+            # Records may depend on each other, e.g. through schema validators that
+            # only run once field errors are gone. Report the errors by position in
+            # the batch, like those of the first pass.
+            messages = error.messages
+            if isinstance(messages, dict) and all(
+                isinstance(index, int) for index in messages
+            ):
+                messages = {
+                    positions[index]: message for index, message in messages.items()
+                }
+            on_error(
+                ValidationError(messages, data=batch, valid_data=error.valid_data),
+                batch,
+                offset,
+            )
+            return []
+
+    def load_update(self, data, *, session=None, many=None, partial=True, **kwargs):
+        """Validate a partial payload and apply it to existing rows with ``UPDATE``
+        statements, without loading the rows first.
+
+        Each item must include the primary key(s) of the row to update and, if the
+        model has a ``version_id_col``, its current version, which is checked
+        and incremented. When ``many`` is `True`, all rows are updated with an ORM
+        bulk UPDATE by primary key (``executemany``).
+
+        :param data: The data to deserialize.
+        :param session: Optional SQLAlchemy session.
+        :param many: Whether to deserialize `data` as a collection. If `None`, the
+            value for `self.many` is used.
+        :param partial: Whether to ignore missing fields. Defaults to `True`.
+        :param kwargs: Additional keyword arguments passed to `load`.
+        :return: The validated data.
+        :raises ValidationError: If the data are invalid or a primary key or version
+            is missing.
+        :raises StaleDataError: If a row does not exist or its version does not match.
+        """
+        model = self.opts.model
+        if model is None:
+            raise ValueError("`load_update` requires the `model` option to be set.")
+        many = self.many if many is None else bool(many)
+        session = session or self.session
+        if session is None:
+            raise ValueError("Deserialization requires a session")
+        result = self.load(
+            data,
+            session=session,
+            many=many,
+            partial=partial,
+            load_instance=False,
+            **kwargs,
+        )
+        mapper = sa.inspect(model)
+        pk_keys = list(get_primary_key_info(model).keys)
+        version_key = (
+            mapper.get_property_by_column(mapper.version_id_col).key
+            if mapper.version_id_col is not None
+            else None
+        )
+        required_keys = pk_keys + [version_key] if version_key else pk_keys
+        column_keys = {prop.key for prop in mapper.column_attrs}
+        rows = result if many else [result]
+        errors = {}
+        for index, row in enumerate(rows):
+            invalid_keys = set(row) - column_keys
+            if invalid_keys:
+                raise ValueError(
+                    f"Cannot update non-column attributes: {sorted(invalid_keys)}."
+                )
+            for key in required_keys:
+                if row.get(key) is None:
+                    load_field = self._get_load_field(key)
+                    data_key, field_obj = load_field or (key, None)
+                    message = (
+                        field_obj.error_messages["required"]
+                        if field_obj is not None
+                        else "Missing data for required field."
+                    )
+                    errors.setdefault(index, {})[data_key] = [message]
+        if errors:
+            raise ValidationError(
+                errors if many else errors[0], data=data, valid_data=result
+            )
+        if many:
+            session.bulk_update_mappings(model, rows)
+            return result
+        criteria = [getattr(model, key) == result[key] for key in required_keys]
+        values = {
+            getattr(model, key): value
+            for key, value in result.items()
+            if key not in required_keys
+        }
+        if version_key and mapper.version_id_generator:
+            values[getattr(model, version_key)] = mapper.version_id_generator(
+                result[version_key]
+            )
+        if values:
+            rowcount = session.execute(
+                sa.update(model).where(*criteria).values(values)
+            ).rowcount
+            if rowcount != 1:
+                raise StaleDataError(
+                    f"UPDATE statement on table '{mapper.local_table.name}' "
+                    f"expected to update 1 row(s); {rowcount} were matched."
+                )
+        return result
+
 
 class SQLAlchemyAutoSchema(SQLAlchemySchema, metaclass=SQLAlchemyAutoSchemaMeta):
     """Schema that automatically generates fields from the columns of
@@ -188,6 +849,308 @@ class SQLAlchemyAutoSchema(SQLAlchemySchema, metaclass=SQLAlchemyAutoSchemaMeta)
     OPTIONS_CLASS = SQLAlchemyAutoSchemaOpts
 
 
+class SQLAlchemyPolymorphicSchema(SQLAlchemyAutoSchema):
+    """Auto schema for the base model of an inheritance hierarchy (joined- or
+    single-table) that dispatches each object or payload to a schema generated
+    for its subclass.
+
+    Subclass schemas are generated once per mapper from this schema's ``Meta``
+    (with ``model`` set to the subclass) and cached. Objects are dispatched by their
+    mapper; payloads by the value of the ``polymorphic_on`` column, looked up in the
+    mapper's ``polymorphic_map``. Payloads without a polymorphic identity, and all
+    payloads if the base model has no ``polymorphic_on`` column, are loaded with
+    the base model. With ``many=True``, items are grouped by subclass, so each
+    subclass is (de)serialized in one batch and existing instances are looked up
+    with one query per subclass.
+
+    Example: ::
+
+        from marshmallow_sqlalchemy import SQLAlchemyPolymorphicSchema
+
+        from mymodels import Employee
+
+
+        class EmployeeSchema(SQLAlchemyPolymorphicSchema):
+            class Meta:
+                model = Employee
+
+    .. note::
+
+        ``pass_many`` processors run once per subclass batch.
+    """
+
+    # Set on generated subclass schemas, which do not dispatch further.
+    _polymorphic_variant = False
+
+    def __init__(self, *args, **kwargs):
+        self._variant_kwargs = kwargs
+        self._variants = {}
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def _get_variant_class(cls, mapper):
+        variant_classes = cls.__dict__.get("_variant_classes")
+        if variant_classes is None:
+            variant_classes = cls._variant_classes = {}
+        variant_class = variant_classes.get(mapper)
+        if variant_class is None:
+            meta = type(
+                "Meta", (cls.Meta,), {"model": mapper.class_, "register": False}
+            )
+            variant_class = type(
+                f"{cls.__name__}[{mapper.class_.__name__}]",
+                (cls,),
+                {
+                    "Meta": meta,
+                    "_polymorphic_variant": True,
+                    "__module__": cls.__module__,
+                },
+            )
+            variant_classes[mapper] = variant_class
+        return variant_class
+
+    @classmethod
+    def _warm_up(cls, seen):
+        super()._warm_up(seen)
+        if not cls._polymorphic_variant and cls.opts.model is not None:
+            for mapper in sa.inspect(cls.opts.model).self_and_descendants:
+                cls._get_variant_class(mapper)._warm_up(seen)
+
+    def _get_variant(self, mapper):
+        variant = self._variants.get(mapper)
+        if variant is None:
+            variant = self._variants[mapper] = self._get_variant_class(mapper)(
+                **{**self._variant_kwargs, "many": False}
+            )
+        return variant
+
+    def _get_mapper_for_data(self, data):
+        """Return the mapper to load ``data`` with.
+
+        :raises ValidationError: If the polymorphic identity is unknown.
+        """
+        base_mapper = sa.inspect(self.opts.model)
+        if base_mapper.polymorphic_on is None:
+            # Subclasses are not distinguished by a column, e.g. with concrete
+            # table inheritance or without inheritance at all
+            return base_mapper
+        key = base_mapper.get_property_by_column(base_mapper.polymorphic_on).key
+        load_field = self._get_load_field(key)
+        data_key, field_obj = load_field or (key, None)
+        identity = data.get(data_key) if isinstance(data, Mapping) else None
+        if identity is None:
+            return base_mapper
+        if field_obj is not None:
+            identity = field_obj.deserialize(identity, data_key, data)
+        try:
+            return base_mapper.polymorphic_map[identity]
+        except KeyError as error:
+            raise ValidationError(
+                {data_key: [f"Unknown polymorphic identity {identity!r}."]}
+            ) from error
+
+    def dump(self, obj, *, many=None):
+        if self._polymorphic_variant:
+            return super().dump(obj, many=many)
+        many = self.many if many is None else bool(many)
+        if not many:
+            state = sa.inspect(obj, raiseerr=False)
+            mapper = state.mapper if state is not None else sa.inspect(self.opts.model)
+            return self._get_variant(mapper).dump(obj)
+        objs = list(obj)
+        groups = {}
+        for index, item in enumerate(objs):
+            state = sa.inspect(item, raiseerr=False)
+            mapper = state.mapper if state is not None else sa.inspect(self.opts.model)
+            groups.setdefault(mapper, []).append(index)
+        result = [None] * len(objs)
+        with dump_memo():
+            for mapper, indices in groups.items():
+                dumped = self._get_variant(mapper).dump(
+                    [objs[index] for index in indices], many=True
+                )
+                for index, item in zip(indices, dumped):
+                    result[index] = item
+        return result
+
+    def load(self, data, *, many=None, **kwargs):
+        if self._polymorphic_variant:
+            return super().load(data, many=many, **kwargs)
+        many = self.many if many is None else bool(many)
+        if not many:
+            return self._get_variant(self._get_mapper_for_data(data)).load(
+                data, **kwargs
+            )
+        if not is_collection(data):
+            raise ValidationError([self.error_messages["type"]])
+        items = list(data)
+        groups = {}
+        errors = {}
+        for index, item in enumerate(items):
+            try:
+                mapper = self._get_mapper_for_data(item)
+            except ValidationError as error:
+                errors[index] = error.messages
+            else:
+                groups.setdefault(mapper, []).append(index)
+        result = [None] * len(items)
+        for mapper, indices in groups.items():
+            try:
+                loaded = self._get_variant(mapper).load(
+                    [items[index] for index in indices], many=True, **kwargs
+                )
+            except ValidationError as error:
+                for key, messages in error.normalized_messages().items():
+                    if isinstance(key, int):
+                        errors[indices[key]] = messages
+                    else:
+                        errors.setdefault(key, []).extend(messages)
+                loaded = error.valid_data or []
+            for index, item in zip(indices, loaded):
+                result[index] = item
+        if errors:
+            raise ValidationError(errors, data=data, valid_data=result)
+        return result
+
+    def validate(self, data, *, many=None, **kwargs):
+        if self._polymorphic_variant:
+            return super().validate(data, many=many, **kwargs)
+        many = self.many if many is None else bool(many)
+        if not many:
+            try:
+                mapper = self._get_mapper_for_data(data)
+            except ValidationError as error:
+                return error.messages
+            return self._get_variant(mapper).validate(data, **kwargs)
+        if not is_collection(data):
+            return {"_schema": [self.error_messages["type"]]}
+        items = list(data)
+        groups = {}
+        errors = {}
+        for index, item in enumerate(items):
+            try:
+                mapper = self._get_mapper_for_data(item)
+            except ValidationError as error:
+                errors[index] = error.messages
+            else:
+                groups.setdefault(mapper, []).append(index)
+        for mapper, indices in groups.items():
+            messages = self._get_variant(mapper).validate(
+                [items[index] for index in indices], many=True, **kwargs
+            )
+            for key, value in messages.items():
+                if isinstance(key, int):
+                    errors[indices[key]] = value
+                else:
+                    errors.setdefault(key, []).extend(value)
+        return errors
+
+
+class _TableSchemas(Mapping):
+    """Mapping of table names to schema classes that are generated on first access.
+    See `schemas_for_metadata`.
+    """
+
+    def __init__(self, metadata, schema_class, options):
+        self._tables = metadata.tables
+        self._schema_class = schema_class
+        self._options = options
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name):
+        schema = self._schemas.get(name)
+        if schema is None:
+            table = self._tables[name]
+            meta = type(
+                "Meta",
+                (getattr(self._schema_class, "Meta", object),),
+                {"table": table, "register": False, **self._options},
+            )
+            schema = type(
+                f"{table.name.title().replace('_', '')}Schema",
+                (self._schema_class,),
+                {"Meta": meta, "__module__": self._schema_class.__module__},
+            )
+            with self._lock:
+                # Another thread may have built the schema in the meantime
+                schema = self._schemas.setdefault(name, schema)
+        return schema
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def __repr__(self):
+        return f"<{type(self).__name__}({list(self._tables)!r})>"
+
+
+def schemas_for_metadata(
+    metadata,
+    *,
+    schema_class=SQLAlchemyAutoSchema,
+    converter=None,
+    prebuild=False,
+    max_workers=None,
+    **options,
+):
+    """Return a mapping of the table names of ``metadata`` (e.g. reflected from a
+    database) to `SQLAlchemyAutoSchema` classes for the tables.
+
+    Schema classes are generated when they are first accessed and share a single
+    `ModelConverter`. ::
+
+        metadata = sa.MetaData()
+        metadata.reflect(engine)
+        schemas = schemas_for_metadata(metadata, include_fk=True)
+        UserSchema = schemas["user"]
+
+    :param sqlalchemy.MetaData metadata: Metadata containing the tables.
+    :param type schema_class: Base class of the generated schemas.
+    :param ModelConverter converter: Converter shared by the generated schemas.
+        Defaults to a `ModelConverter` for ``schema_class``.
+    :param bool prebuild: Whether to generate all schemas before returning,
+        on a thread pool.
+    :param int max_workers: Maximum number of threads used to prebuild schemas.
+    :param options: Additional ``class Meta`` options of the generated schemas.
+    :return: A read-only mapping of table names to schema classes.
+    """
+    if converter is None:
+        converter = schema_class.opts.model_converter
+        if not isinstance(converter, ModelConverter):
+            converter = converter(schema_cls=schema_class)
+    schemas = _TableSchemas(
+        metadata, schema_class, {"model_converter": converter, **options}
+    )
+    if prebuild:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for _ in executor.map(schemas.__getitem__, list(schemas)):
+                pass
+    return schemas
+
+
+def warm_up_all(*, freeze=False):
+    """Warm up all `SQLAlchemySchema` subclasses defined so far that have a
+    ``model`` or ``table``. See `SQLAlchemySchema.warm_up`.
+
+    :param bool freeze: Whether to move all objects tracked by the garbage collector
+        to a permanent generation afterwards with `gc.freeze`, so that collections in
+        forked worker processes do not touch (and copy) the pages they are on.
+    """
+    seen = set()
+    classes = [SQLAlchemySchema]
+    while classes:
+        cls = classes.pop()
+        classes.extend(cls.__subclasses__())
+        if cls.opts.model is not None or cls.opts.table is not None:
+            cls._warm_up(seen)
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+
 def auto_field(
     column_name: str = None,
     *,
@@ -0,0 +1,249 @@
+"""Mixin that adds validation of loaded data against the database.
+
+.. warning::
+
+    This module is treated as private API.
+    Users should not need to use this module directly.
+"""
+
+from collections.abc import Mapping
+
+import marshmallow as ma
+import sqlalchemy as sa
+
+from .fields import ForeignKeyReference, Related, key_in
+from .load_instance_mixin import _load_context
+
+
+class ValidationMixin:
+    class Opts:
+        def __init__(self, meta, *args, **kwargs):
+            super().__init__(meta, *args, **kwargs)
+            self.validate_foreign_keys = getattr(meta, "validate_foreign_keys", False)
+            self.validate_unique = getattr(meta, "validate_unique", False)
+
+    class Schema:
+        error_messages = {
+            "foreign_key": "Related {table} row does not exist.",
+            "unique": "A {table} row with this value already exists.",
+            "duplicate": "Value is not unique within the payload (see item {index}).",
+        }
+
+        @ma.validates_schema(pass_many=True, skip_on_field_errors=False)
+        def _validate_foreign_keys(self, data, *, many, **kwargs):
+            """Check that the rows referenced by foreign key values exist, with one
+            query per foreign key constraint for the whole payload.
+
+            Values of items with field errors are checked too, so that all errors
+            are reported at once.
+            """
+            if not self.opts.validate_foreign_keys or self.transient:
+                return
+            items = self._get_items_to_validate(data, many=many)
+            if not items:
+                return
+            if self.session is None:
+                raise ValueError("Foreign key validation requires a session")
+            session = self.lookup_session
+            errors = {}
+            for constraint, local_keys in self._get_foreign_key_constraints():
+                values_by_index = {}
+                for index, item in items.items():
+                    key = tuple(item.get(local_key) for local_key in local_keys)
+                    if None not in key:
+                        values_by_index[index] = key
+                if not values_by_index:
+                    continue
+                remote_columns = [element.column for element in constraint.elements]
+                existing = self._get_existing_keys(
+                    session, remote_columns, set(values_by_index.values())
+                )
+                message = self.error_messages["foreign_key"].format(
+                    table=constraint.referred_table.name
+                )
+                for index, key in values_by_index.items():
+                    if key not in existing:
+                        self._add_error(errors, index, local_keys, message)
+            if errors:
+                raise ma.ValidationError(errors if many else errors[0])
+
+        @ma.validates_schema(pass_many=True, skip_on_field_errors=False)
+        def _validate_unique(self, data, *, many, **kwargs):
+            """Check the values of unique constraints and unique indexes, both within
+            the payload and against the database, with one query per constraint.
+
+            Rows matching an item's own primary key, or its ``instance_lookup_keys``
+            if the option is set, are not conflicts.
+            """
+            if not self.opts.validate_unique:
+                return
+            items = self._get_items_to_validate(data, many=many)
+            if not items:
+                return
+            # Transient schemas only check for duplicates within the payload
+            session = None if self.transient else self.session
+            if session is None and not self.transient:
+                raise ValueError("Unique validation requires a session")
+            if session is not None:
+                session = self.lookup_session
+            pk_columns, pk_keys = self._get_identity_columns()
+            own_keys = {
+                index: tuple(item.get(key) for key in pk_keys)
+                for index, item in items.items()
+            }
+            context = _load_context.get(None)
+            if not many and context is not None and context.instance is not None:
+                if sa.inspect(context.instance).identity is not None:
+                    own_keys[0] = tuple(
+                        getattr(context.instance, key) for key in pk_keys
+                    )
+            errors = {}
+            for table, columns, local_keys in self._get_unique_constraints():
+                first_index_by_value = {}
+                for index, item in items.items():
+                    value = tuple(item.get(key) for key in local_keys)
+                    if None in value:
+                        continue
+                    first_index = first_index_by_value.setdefault(value, index)
+                    if first_index != index:
+                        message = self.error_messages["duplicate"].format(
+                            index=first_index
+                        )
+                        self._add_error(errors, index, local_keys, message)
+                if session is None or not first_index_by_value:
+                    continue
+                message = self.error_messages["unique"].format(table=table.name)
+                query = sa.select(*columns, *pk_columns).where(
+                    key_in(columns, first_index_by_value)
+                )
+                for row in session.execute(query):
+                    value = tuple(row[: len(columns)])
+                    row_key = tuple(row[len(columns) :])
+                    # Rows may not match any item if the database compares
+                    # values differently (e.g. case-insensitive collations)
+                    index = first_index_by_value.get(value)
+                    if index is not None and own_keys[index] != row_key:
+                        self._add_error(errors, index, local_keys, message)
+            if errors:
+                raise ma.ValidationError(errors if many else errors[0])
+
+        def _add_error(self, errors, index, attributes, message):
+            for data_key in self._get_data_keys(attributes):
+                messages = errors.setdefault(index, {}).setdefault(data_key, [])
+                # Columns may be covered by several constraints
+                if message not in messages:
+                    messages.append(message)
+
+        def _get_items_to_validate(self, data, *, many):
+            """Return a mapping of item index to the item's attribute values, with
+            `ForeignKeyReference` values replaced by the values they hold.
+            """
+            items = {}
+            for index, item in enumerate(data if many else [data]):
+                if not isinstance(item, Mapping):
+                    continue
+                values = {}
+                for key, value in item.items():
+                    if isinstance(value, ForeignKeyReference):
+                        values.update(value.values)
+                    else:
+                        values[key] = value
+                items[index] = values
+            return items
+
+        def _get_tables(self):
+            """Return the tables of the schema's model or table, and a function
+            returning the attribute key of a column.
+            """
+            if self.opts.model is not None:
+                mapper = sa.inspect(self.opts.model)
+
+                def get_key(column):
+                    return mapper.get_property_by_column(column).key
+
+                return mapper.tables, get_key
+            return [self.opts.table], lambda column: column.key
+
+        def _get_foreign_key_constraints(self):
+            """Return pairs of (foreign key constraint, local attribute keys)."""
+            tables, get_key = self._get_tables()
+            return [
+                (
+                    constraint,
+                    tuple(get_key(element.parent) for element in constraint.elements),
+                )
+                for table in tables
+                for constraint in table.foreign_key_constraints
+            ]
+
+        def _get_unique_constraints(self):
+            """Return tuples of (table, columns, attribute keys) for the unique
+            constraints and unique indexes of the schema's tables.
+            """
+            tables, get_key = self._get_tables()
+            constraints = {}
+            for table in tables:
+                column_sets = [
+                    constraint.columns
+                    for constraint in table.constraints
+                    if isinstance(constraint, sa.UniqueConstraint)
+                ] + [index.columns for index in table.indexes if index.unique]
+                for columns in column_sets:
+                    columns = tuple(columns)
+                    keys = tuple(get_key(column) for column in columns)
+                    constraints.setdefault(keys, (table, columns, keys))
+            return [constraints[keys] for keys in sorted(constraints)]
+
+        def _get_identity_columns(self):
+            """Return the columns identifying the row of an item, i.e. the primary key
+            or ``instance_lookup_keys`` columns, and their attribute keys.
+            """
+            _, get_key = self._get_tables()
+            if self.opts.model is not None:
+                mapper = sa.inspect(self.opts.model)
+                lookup_keys = self.opts.instance_lookup_keys
+                if lookup_keys:
+                    columns = tuple(mapper.attrs[key].columns[0] for key in lookup_keys)
+                else:
+                    columns = tuple(mapper.primary_key)
+            else:
+                columns = tuple(self.opts.table.primary_key.columns)
+            return columns, tuple(get_key(column) for column in columns)
+
+        def _get_data_keys(self, attributes):
+            """Return the data keys of the load fields for the given attributes.
+
+            Attributes set by a reference-only `Related` field map to its data key.
+            """
+            data_keys = []
+            for attribute in attributes:
+                load_field = self._get_load_field(attribute)
+                if load_field is None:
+                    load_field = self._get_reference_field(attribute)
+                data_key = load_field[0] if load_field is not None else attribute
+                if data_key not in data_keys:
+                    data_keys.append(data_key)
+            return data_keys
+
+        def _get_reference_field(self, attribute):
+            for field_name, field_obj in self.load_fields.items():
+                if (
+                    isinstance(field_obj, Related)
+                    and field_obj.reference_only
+                    and attribute in dict(field_obj._get_foreign_keys())
+                ):
+                    data_key = (
+                        field_obj.data_key
+                        if field_obj.data_key is not None
+                        else field_name
+                    )
+                    return data_key, field_obj
+            return None
+
+        @staticmethod
+        def _get_existing_keys(session, columns, keys):
+            """Return the subset of ``keys`` (tuples of values of ``columns``)
+            that exist in the database.
+            """
+            rows = session.execute(sa.select(*columns).where(key_in(columns, keys)))
+            return {tuple(row) for row in rows}
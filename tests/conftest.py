@@ -15,6 +15,25 @@ from sqlalchemy.orm import (
 )
 
 
+def pytest_addoption(parser):
+    parser.addoption("--memory", action="store_true", help="Run the memory benchmarks.")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "memory: memory benchmark, only run with --memory"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--memory"):
+        return
+    skip_memory = pytest.mark.skip(reason="Needs --memory to run.")
+    for item in items:
+        if "memory" in item.keywords:
+            item.add_marker(skip_memory)
+
+
 class AnotherInteger(sa.Integer):
     """Use me to test if MRO works like we want"""
 
@@ -44,6 +63,19 @@ def session(Base, models, engine):
     return Session(future=True)
 
 
+@pytest.fixture()
+def statements(engine):
+    """List of the SQL statements executed by ``engine``."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    sa.event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    sa.event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture()
 def models(Base):
     # models adapted from https://github.com/wtforms/wtforms-sqlalchemy/blob/master/tests/tests.py
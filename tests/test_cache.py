@@ -0,0 +1,216 @@
+import json
+
+import pytest
+import sqlalchemy as sa
+from marshmallow import EXCLUDE, fields
+from sqlalchemy.orm import sessionmaker
+
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, SQLAlchemySchema, auto_field
+from marshmallow_sqlalchemy.cache import DumpCache, RelatedCache
+from marshmallow_sqlalchemy.fields import Related
+
+
+@pytest.fixture
+def school(models, session):
+    school = models.School(id=42, name="Univ. Of Whales")
+    session.add(school)
+    session.commit()
+    return school
+
+
+class TestRelatedCache:
+    @pytest.fixture
+    def cache(self):
+        return RelatedCache(maxsize=2)
+
+    @pytest.fixture
+    def schema(self, models, cache):
+        class TeacherSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Teacher
+                load_instance = True
+
+            full_name = auto_field()
+            current_school = Related(cache=cache)
+
+        return TeacherSchema()
+
+    def test_hit_does_not_query(self, schema, school, engine, statements):
+        Session = sessionmaker(bind=engine)
+        first_session = Session()
+        teacher = schema.load(
+            {"full_name": "Teachy", "current_school": 42}, session=first_session
+        )
+        assert teacher.current_school.name == "Univ. Of Whales"
+        assert len(statements) == 1
+
+        second_session = Session()
+        teacher = schema.load(
+            {"full_name": "Teachy", "current_school": 42}, session=second_session
+        )
+        assert len(statements) == 1
+        assert teacher.current_school in second_session
+        assert teacher.current_school.name == "Univ. Of Whales"
+        assert sa.inspect(teacher.current_school).persistent
+
+    def test_hit_keeps_pending_changes(self, schema, school, engine, statements):
+        Session = sessionmaker(bind=engine)
+        schema.load({"full_name": "Teachy", "current_school": 42}, session=Session())
+        session = Session()
+        held = session.get(type(school), 42)
+        held.name = "Changed"
+        statements.clear()
+        teacher = schema.load(
+            {"full_name": "Teachy", "current_school": 42}, session=session
+        )
+        assert teacher.current_school is held
+        assert held.name == "Changed"
+        assert statements == []
+
+    def test_update_invalidates(self, schema, school, session, cache):
+        teacher = schema.load(
+            {"full_name": "Teachy", "current_school": 42}, session=session
+        )
+        session.add(teacher)
+        session.flush()
+        assert len(cache) == 1
+        school.name = "Univ. Of Dolphins"
+        session.flush()
+        assert len(cache) == 0
+
+    def test_delete_invalidates(self, schema, school, session, cache):
+        schema.load({"full_name": "Teachy", "current_school": 42}, session=session)
+        session.expunge_all()
+        session.delete(session.get(type(school), 42))
+        session.flush()
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, models, schema, session, cache):
+        session.add_all([models.School(id=i, name=f"School {i}") for i in (1, 2, 3)])
+        session.commit()
+        for index, school_id in enumerate((1, 2, 1, 3)):
+            teacher = schema.load(
+                {"full_name": f"Teachy {index}", "current_school": school_id},
+                session=session,
+            )
+            session.add(teacher)
+        assert len(cache) == 2
+        assert cache.get_instance(session, models.School, (("id", 1),)) is not None
+        assert cache.get_instance(session, models.School, (("id", 2),)) is None
+
+    def test_ttl(self, models, school, session, monkeypatch):
+        cache = RelatedCache(ttl=10)
+        now = 1000.0
+        monkeypatch.setattr("time.monotonic", lambda: now)
+        school = session.get(models.School, 42)
+        cache.add_instance(models.School, (("id", 42),), school)
+        assert cache.get_instance(session, models.School, (("id", 42),)) is school
+        now += 10
+        assert cache.get_instance(session, models.School, (("id", 42),)) is None
+        assert len(cache) == 0
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError, match="maxsize"):
+            RelatedCache(maxsize=0)
+
+
+class TestDumpCache:
+    @pytest.fixture
+    def cache(self):
+        return DumpCache(maxsize=10)
+
+    @pytest.fixture
+    def schema_class(self, models, cache):
+        calls = []
+
+        class SchoolSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.School
+                dump_cache = cache
+
+            calls_ = fields.Function(lambda obj: calls.append(obj) or len(calls))
+
+        SchoolSchema.calls = calls
+        return SchoolSchema
+
+    def test_hit_does_not_serialize(self, schema_class, school):
+        schema = schema_class()
+        first = schema.dump(school)
+        assert schema.dump(school) == first
+        assert schema_class().dump([school], many=True) == [first]
+        assert len(schema_class.calls) == 1
+        # `dump_json` output is cached separately
+        assert json.loads(schema.dump_json(school)) == {**first, "calls_": 2}
+        assert json.loads(schema.dump_json(school)) == {**first, "calls_": 2}
+
+    def test_cached_data_is_copied(self, schema_class, school):
+        schema = schema_class()
+        schema.dump(school)["name"] = "Changed"
+        assert schema.dump(school)["name"] == "Univ. Of Whales"
+
+    def test_projections_are_cached_separately(self, schema_class, school):
+        assert schema_class(only=("id",)).dump(school) == {"id": 42}
+        assert schema_class().dump(school)["name"] == "Univ. Of Whales"
+
+    def test_pending_changes_are_not_cached(self, schema_class, school, cache):
+        schema = schema_class()
+        school.name = "Univ. Of Dolphins"
+        assert schema.dump(school)["name"] == "Univ. Of Dolphins"
+        assert len(cache) == 0
+
+    def test_update_invalidates(self, schema_class, school, session, cache):
+        schema = schema_class()
+        schema.dump(school)
+        assert len(cache) == 1
+        school.name = "Univ. Of Dolphins"
+        session.flush()
+        assert len(cache) == 0
+        assert schema.dump(school)["name"] == "Univ. Of Dolphins"
+
+    def test_delete_invalidates(self, schema_class, school, session, cache):
+        schema_class().dump(school)
+        session.delete(school)
+        session.flush()
+        assert len(cache) == 0
+
+    def test_version_is_part_of_key(self, Base, engine, cache):
+        class Widget(Base):
+            __tablename__ = "widget"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.String)
+            version = sa.Column(sa.Integer, nullable=False)
+            __mapper_args__ = {"version_id_col": version}
+
+        class WidgetSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = Widget
+                dump_cache = cache
+
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.add(Widget(id=1, name="Foo"))
+        session.commit()
+        widget = session.get(Widget, 1)
+        assert WidgetSchema().dump(widget)["name"] == "Foo"
+        # Updated without going through the ORM, so no event is emitted
+        session.execute(sa.update(Widget.__table__).values(name="Bar", version=2))
+        session.expire(widget)
+        assert WidgetSchema().dump(widget) == {"id": 1, "name": "Bar", "version": 2}
+
+    def test_unloaded_attributes_are_part_of_key(self, models, school, session, cache):
+        class SchoolSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.School
+                dump_cache = cache
+                dump_unloaded = EXCLUDE
+
+        schema = SchoolSchema()
+        session.expunge_all()
+        deferred = session.scalars(
+            sa.select(models.School).options(sa.orm.defer(models.School.name))
+        ).one()
+        assert schema.dump(deferred) == {"id": 42}
+        session.expunge_all()
+        loaded = session.get(models.School, 42)
+        assert schema.dump(loaded) == {"id": 42, "name": "Univ. Of Whales"}
+        assert len(cache) == 2
@@ -14,9 +14,15 @@ from marshmallow_sqlalchemy import (
     column2field,
     field_for,
     fields_for_model,
+    profile_conversion,
     property2field,
 )
-from marshmallow_sqlalchemy.fields import Related, RelatedList
+from marshmallow_sqlalchemy.fields import (
+    Related,
+    RelatedList,
+    get_primary_key_info,
+    get_primary_keys,
+)
 
 
 def contains_validator(field, v_type):
@@ -67,6 +73,14 @@ class TestModelFieldConversion:
         fields_ = fields_for_model(models.Student)
         assert fields_["dob"].allow_none is True
 
+    def test_length_validators_are_interned(self, models):
+        fields_ = fields_for_model(models.Student)
+        other_fields = fields_for_model(models.Teacher)
+        validator = contains_validator(fields_["full_name"], validate.Length)
+        assert validator is contains_validator(
+            other_fields["full_name"], validate.Length
+        )
+
     def test_sets_enum_choices(self, models):
         fields_ = fields_for_model(models.Course)
         validator = contains_validator(fields_["level"], validate.OneOf)
@@ -342,6 +356,65 @@ class TestFieldFor:
         assert field.dump_only is True
 
 
+class TestPrimaryKeyInfo:
+    def test_primary_key_info(self, models):
+        info = get_primary_key_info(models.School)
+        assert info.props == (models.School.id.property,)
+        assert info.keys == ("id",)
+        assert info.get_key(models.School(id=42)) == (42,)
+        assert info.key_from_mapping({"id": 42, "name": "x"}) == (42,)
+        assert get_primary_keys(models.School) == [models.School.id.property]
+
+    def test_composite_primary_key_info(self, models):
+        info = get_primary_key_info(models.Seminar)
+        assert info.keys == ("title", "semester")
+        seminar = models.Seminar(title="Math", semester="Fall")
+        assert info.get_key(seminar) == ("Math", "Fall")
+        assert info.key_from_mapping({"title": "Math"}) == ("Math", None)
+
+    def test_primary_key_info_is_cached_until_reconfigured(self, models, Base):
+        info = get_primary_key_info(models.School)
+        assert get_primary_key_info(models.School) is info
+
+        class Other(Base):
+            __tablename__ = "other"
+            id = sa.Column(sa.Integer, primary_key=True)
+
+        Base.registry.configure()
+        assert get_primary_key_info(models.School) is not info
+
+
+class TestProfileConversion:
+    def test_profile_conversion(self, models):
+        with profile_conversion() as profile:
+            fields_for_model(models.Student)
+            column2field(models.Course.__table__.c.cost)
+        fields_for_model(models.Teacher)
+        methods = {method for method, _ in profile.timings}
+        assert methods == {
+            "fields_for_model",
+            "property2field",
+            "column2field",
+            "_get_field_class_for_data_type",
+        }
+        assert profile.timings["fields_for_model", "Student"][0] == 1
+        assert ("fields_for_model", "Teacher") not in profile.timings
+        assert profile.timings["column2field", "course"][0] == 1
+        assert profile.timings["_get_field_class_for_data_type", "Numeric"][0] == 1
+        calls, seconds = profile.timings["property2field", "Student"]
+        assert calls > 1
+        assert seconds > 0
+
+    def test_report(self, models):
+        with profile_conversion() as profile:
+            fields_for_model(models.Student)
+        lines = profile.report().splitlines()
+        assert lines[0].split() == ["method", "key", "calls", "total", "ms", "ms/call"]
+        # The model's conversion includes the others, so it is the slowest
+        assert lines[1].split()[:3] == ["fields_for_model", "Student", "1"]
+        assert len(profile.report(limit=2).splitlines()) == 3
+
+
 def _repr_validator_list(validators):
     return sorted(repr(validator) for validator in validators)
 
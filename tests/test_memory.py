@@ -0,0 +1,179 @@
+"""Memory benchmarks, measured with tracemalloc. They are skipped unless pytest
+is run with ``--memory``.
+
+Thresholds are about twice the highest figures measured on CPython 3.11 with the
+supported marshmallow and SQLAlchemy versions, so that they catch regressions in
+field construction, validator duplication or per-row overhead rather than noise
+between dependency versions.
+"""
+
+import datetime as dt
+import decimal
+import gc
+import tracemalloc
+
+import pytest
+import sqlalchemy as sa
+
+from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
+
+pytestmark = pytest.mark.memory
+
+NUM_COLUMNS = 50
+NUM_INSTANCES = 100
+
+# Number of copies of each column of the scaled models
+SCALE = 10
+NUM_MODELS = 20
+NUM_ROWS = 10_000
+
+MAX_BYTES_PER_SCHEMA_CLASS = 448 * 1024
+MAX_BYTES_PER_SCHEMA_INSTANCE = 144 * 1024
+MAX_BYTES_PER_DUMPED_ROW = 1024
+MAX_BYTES_PER_LOADED_ROW = 1024
+MAX_PEAK_BYTES_PER_ROW = 1024
+
+
+def measure(factory):
+    """Return the number of bytes still allocated by ``factory()`` after it returns."""
+    return measure_peak(factory)[0]
+
+
+def measure_peak(factory):
+    """Return the number of bytes still allocated by ``factory()`` after it returns,
+    and the peak number of bytes allocated while it ran.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = factory()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current - before, peak - before
+
+
+@pytest.fixture
+def WideModel(Base):
+    columns = {
+        f"column_{index}": sa.Column(sa.String(255), nullable=False)
+        for index in range(NUM_COLUMNS)
+    }
+    return type(
+        "WideModel",
+        (Base,),
+        {
+            "__tablename__": "wide_model",
+            "id": sa.Column(sa.Integer, primary_key=True),
+            **columns,
+        },
+    )
+
+
+def make_schema_class(model, **options):
+    meta = type("Meta", (), {"model": model, **options})
+    return type("WideSchema", (SQLAlchemyAutoSchema,), {"Meta": meta})
+
+
+# Columns of the ``Course`` and ``Student`` models of conftest.py, with values
+def course_columns():
+    return {
+        "name": (sa.Column(sa.String(255), nullable=False), "Physics"),
+        "cost": (
+            sa.Column(sa.Numeric(5, 2), nullable=False),
+            decimal.Decimal("1.50"),
+        ),
+        "description": (sa.Column(sa.Text, nullable=True), None),
+        "level": (sa.Column(sa.Enum("Primary", "Secondary")), "Primary"),
+        "has_prereqs": (sa.Column(sa.Boolean, nullable=False), True),
+        "started": (
+            sa.Column(sa.DateTime, nullable=False),
+            dt.datetime(2024, 1, 2),
+        ),
+        "dob": (sa.Column(sa.Date(), nullable=True), dt.date(2000, 1, 2)),
+    }
+
+
+def make_scaled_model(Base, name, *, scale=SCALE):
+    """Return a model with ``scale`` copies of each column of `course_columns`,
+    and the attribute values of an instance.
+    """
+    columns, values = {}, {}
+    for index in range(scale):
+        for key, (column, value) in course_columns().items():
+            columns[f"{key}_{index}"] = column
+            values[f"{key}_{index}"] = value
+    model = type(
+        name,
+        (Base,),
+        {
+            "__tablename__": name.lower(),
+            "id": sa.Column(sa.Integer, primary_key=True),
+            **columns,
+        },
+    )
+    return model, values
+
+
+@pytest.fixture
+def scaled_models(Base):
+    models = [
+        make_scaled_model(Base, f"ScaledCourse{index}")[0]
+        for index in range(NUM_MODELS)
+    ]
+    Base.registry.configure()
+    return models
+
+
+@pytest.fixture
+def rows_model(Base):
+    model, values = make_scaled_model(Base, "RowsCourse", scale=1)
+    Base.registry.configure()
+    return model, values
+
+
+class TestShareFields:
+    def test_shared_fields_reduce_allocations(self, WideModel):
+        copied_schema = make_schema_class(WideModel, share_fields=False)
+        shared_schema = make_schema_class(WideModel, share_fields=True)
+        # Build the shared prototypes outside of the measurement
+        shared_schema()
+
+        copied = measure(lambda: [copied_schema() for _ in range(NUM_INSTANCES)])
+        shared = measure(lambda: [shared_schema() for _ in range(NUM_INSTANCES)])
+        assert shared < copied / 2
+
+
+class TestMemoryRegression:
+    def test_schema_class(self, scaled_models):
+        retained = measure(
+            lambda: [make_schema_class(model) for model in scaled_models]
+        )
+        assert retained / NUM_MODELS < MAX_BYTES_PER_SCHEMA_CLASS
+
+    def test_schema_instance(self, scaled_models):
+        schema_class = make_schema_class(scaled_models[0])
+        schema_class()
+        retained = measure(lambda: [schema_class() for _ in range(NUM_INSTANCES)])
+        assert retained / NUM_INSTANCES < MAX_BYTES_PER_SCHEMA_INSTANCE
+
+    def test_dump(self, rows_model):
+        model, values = rows_model
+        objs = [model(id=index, **values) for index in range(NUM_ROWS)]
+        schema = make_schema_class(model)()
+        schema.dump(objs[:1], many=True)
+        retained, peak = measure_peak(lambda: schema.dump(objs, many=True))
+        assert retained / NUM_ROWS < MAX_BYTES_PER_DUMPED_ROW
+        assert peak / NUM_ROWS < MAX_PEAK_BYTES_PER_ROW
+
+    def test_load(self, rows_model):
+        model, values = rows_model
+        schema = make_schema_class(model, transient=True)()
+        objs = [model(id=index, **values) for index in range(NUM_ROWS)]
+        data = schema.dump(objs, many=True)
+        schema.load(data[:1], many=True)
+        retained, peak = measure_peak(lambda: schema.load(data, many=True))
+        assert retained / NUM_ROWS < MAX_BYTES_PER_LOADED_ROW
+        assert peak / NUM_ROWS < MAX_PEAK_BYTES_PER_ROW
@@ -1,12 +1,38 @@
+import datetime as dt
+import decimal
+import json
+import threading
+import warnings
+
 import marshmallow
 import pytest
 import sqlalchemy as sa
-from marshmallow import Schema, ValidationError, validate
+from marshmallow import (
+    EXCLUDE,
+    RAISE,
+    Schema,
+    ValidationError,
+    validate,
+    validates_schema,
+)
 from pytest_lazy_fixtures import lf
-
-from marshmallow_sqlalchemy import SQLAlchemyAutoSchema, SQLAlchemySchema, auto_field
-from marshmallow_sqlalchemy.exceptions import IncorrectSchemaTypeError
-from marshmallow_sqlalchemy.fields import Related
+from sqlalchemy.orm.exc import StaleDataError
+
+from marshmallow_sqlalchemy import (
+    ModelConverter,
+    SQLAlchemyAutoSchema,
+    SQLAlchemyPolymorphicSchema,
+    SQLAlchemySchema,
+    auto_field,
+    encoders,
+    schemas_for_metadata,
+    warm_up_all,
+)
+from marshmallow_sqlalchemy.exceptions import (
+    IncorrectSchemaTypeError,
+    UnloadedAttributeError,
+)
+from marshmallow_sqlalchemy.fields import Nested, Related, RelatedList
 
 # -----------------------------------------------------------------------------
 
@@ -455,6 +481,432 @@ class TestModelInstanceDeserialization:
         assert schema.transient is False
 
 
+class TestLoadContext:
+    def test_load_does_not_store_state_on_schema(self, models, session, teacher):
+        class TeacherSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Teacher
+                load_instance = True
+
+        schema = TeacherSchema()
+        loaded = schema.load({"id": teacher.id, "full_name": "New"}, session=session)
+        assert loaded is teacher
+        assert schema.session is None
+        assert schema.transient is False
+        with pytest.raises(ValueError, match="requires a session"):
+            schema.load({"full_name": "New"})
+
+    def test_constructor_instance_is_kept(self, models, session, teacher):
+        class TeacherSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Teacher
+                load_instance = True
+
+        schema = TeacherSchema(instance=teacher, session=session)
+        assert schema.load({"full_name": "First"}) is teacher
+        assert schema.instance is teacher
+        assert schema.load({"full_name": "Second"}) is teacher
+        assert teacher.full_name == "Second"
+
+    def test_nested_schema_inherits_session(self, models, session, teacher):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+            id = auto_field()
+            name = auto_field()
+
+        class TeacherSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Teacher
+                load_instance = True
+
+            id = auto_field()
+            current_school = Nested(SchoolSchema)
+
+        schema = TeacherSchema()
+        loaded = schema.load(
+            {"id": teacher.id, "current_school": {"id": 42, "name": "Renamed"}},
+            session=session,
+        )
+        assert loaded is teacher
+        assert loaded.current_school is teacher.current_school
+        assert loaded.current_school.name == "Renamed"
+        nested_schema = schema.fields["current_school"].schema
+        assert nested_schema.session is None
+
+        transient = schema.load(
+            {"id": teacher.id, "current_school": {"id": 42, "name": "Renamed"}},
+            transient=True,
+        )
+        assert sa.inspect(transient).transient
+        assert sa.inspect(transient.current_school).transient
+
+    def test_shared_schema_across_threads(self, models):
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        class TeacherSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Teacher
+
+            full_name = auto_field()
+
+            @marshmallow.post_load
+            def record_session(self, data, **kwargs):
+                barrier.wait(timeout=5)
+                seen[data["full_name"]] = self.session
+                return data
+
+        schema = TeacherSchema()
+        sessions = {"a": object(), "b": object()}
+        threads = [
+            threading.Thread(
+                target=schema.load,
+                args=({"full_name": name},),
+                kwargs={"session": session},
+            )
+            for name, session in sessions.items()
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert seen == sessions
+
+
+class TestBatchedInstanceLoading:
+    @pytest.fixture
+    def schools(self, models, session):
+        schools = [models.School(id=i, name=f"School {i}") for i in (1, 2)]
+        schools[0].students = [
+            models.Student(id=10, full_name="Bob Smith"),
+            models.Student(id=11, full_name="John Johnson"),
+        ]
+        schools[1].students = [models.Student(id=20, full_name="Jane Doe")]
+        session.add_all(schools)
+        session.commit()
+        session.expunge_all()
+        return schools
+
+    @pytest.fixture
+    def SchoolSchema(self, models):
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+                load_instance = True
+
+            id = auto_field()
+            full_name = auto_field()
+
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+            id = auto_field()
+            name = auto_field()
+            students = Nested(StudentSchema, many=True)
+
+        return SchoolSchema
+
+    def test_one_query_per_model(
+        self, models, session, schools, SchoolSchema, statements
+    ):
+        data = [
+            {
+                "id": 1,
+                "name": "School 1",
+                "students": [
+                    {"id": 10, "full_name": "Bob"},
+                    {"id": 11, "full_name": "John"},
+                    {"id": 12, "full_name": "New Student"},
+                ],
+            },
+            {
+                "id": 2,
+                "name": "School 2",
+                "students": [{"id": 20, "full_name": "Jane"}],
+            },
+            {"id": 3, "name": "New School", "students": []},
+        ]
+        loaded = SchoolSchema(many=True).load(data, session=session)
+        assert [school.id for school in loaded] == [1, 2, 3]
+        assert sa.inspect(loaded[0]).persistent
+        assert sa.inspect(loaded[2]).transient
+        assert [student.full_name for student in loaded[0].students] == [
+            "Bob",
+            "John",
+            "New Student",
+        ]
+        assert sa.inspect(loaded[0].students[0]).persistent
+        lookups = [stmt for stmt in statements if " IN (" in stmt]
+        assert len(lookups) == 2
+        assert not any(
+            stmt.startswith("SELECT")
+            and stmt.endswith(("school.school_id = ?", "student.id = ?"))
+            for stmt in statements
+        )
+
+    def test_identity_map_is_used(
+        self, models, session, schools, SchoolSchema, statements
+    ):
+        existing = session.get(models.School, 1), session.get(models.School, 2)
+        statements.clear()
+        loaded = SchoolSchema(many=True, exclude=("students",)).load(
+            [{"id": 1, "name": "One"}, {"id": 2, "name": "Two"}], session=session
+        )
+        assert tuple(loaded) == existing
+        assert statements == []
+
+
+class TestLoadUpdate:
+    @pytest.fixture
+    def Widget(self, Base, models):
+        class Widget(Base):
+            __tablename__ = "widget"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.String(20), nullable=False)
+            version = sa.Column(sa.Integer, nullable=False)
+            __mapper_args__ = {"version_id_col": version}
+
+        return Widget
+
+    @pytest.fixture
+    def widgets(self, Widget, session):
+        widgets = [Widget(id=1, name="one"), Widget(id=2, name="two")]
+        session.add_all(widgets)
+        session.commit()
+        session.expunge_all()
+        return widgets
+
+    @pytest.fixture
+    def teacher_schema(self, models):
+        class TeacherSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Teacher
+                include_fk = True
+
+        return TeacherSchema()
+
+    @pytest.fixture
+    def widget_schema(self, Widget):
+        class WidgetSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = Widget
+
+        return WidgetSchema()
+
+    def test_load_update(self, models, session, teacher, teacher_schema, statements):
+        session.commit()
+        session.expunge_all()
+        statements.clear()
+        result = teacher_schema.load_update(
+            {"id": 24, "full_name": "Updated"}, session=session
+        )
+        assert result == {"id": 24, "full_name": "Updated"}
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE teacher SET full_name=?")
+        assert session.get(models.Teacher, 24).full_name == "Updated"
+
+    def test_load_update_validates(self, session, teacher, teacher_schema):
+        with pytest.raises(ValidationError) as excinfo:
+            teacher_schema.load_update(
+                {"id": teacher.id, "full_name": None}, session=session
+            )
+        assert "full_name" in excinfo.value.messages
+        with pytest.raises(ValidationError) as excinfo:
+            teacher_schema.load_update({"full_name": "Updated"}, session=session)
+        assert excinfo.value.messages == {"id": ["Missing data for required field."]}
+
+    def test_load_update_missing_row(self, session, teacher_schema):
+        with pytest.raises(StaleDataError):
+            teacher_schema.load_update({"id": 99, "full_name": "x"}, session=session)
+
+    def test_load_update_many(self, Widget, session, widgets, widget_schema):
+        widget_schema.load_update(
+            [
+                {"id": 1, "name": "uno", "version": 1},
+                {"id": 2, "name": "dos", "version": 1},
+            ],
+            session=session,
+            many=True,
+        )
+        assert session.execute(
+            sa.select(Widget.id, Widget.name, Widget.version).order_by(Widget.id)
+        ).all() == [(1, "uno", 2), (2, "dos", 2)]
+        with pytest.raises(ValidationError) as excinfo:
+            widget_schema.load_update(
+                [{"id": 1, "name": "uno", "version": 2}, {"id": 2, "name": "dos"}],
+                session=session,
+                many=True,
+            )
+        assert excinfo.value.messages == {
+            1: {"version": ["Missing data for required field."]}
+        }
+
+    def test_load_update_version_check(self, Widget, session, widgets, widget_schema):
+        widget_schema.load_update(
+            {"id": 1, "name": "uno", "version": 1}, session=session
+        )
+        assert session.execute(
+            sa.select(Widget.name, Widget.version).where(Widget.id == 1)
+        ).one() == ("uno", 2)
+        with pytest.raises(StaleDataError):
+            widget_schema.load_update(
+                {"id": 1, "name": "eins", "version": 1}, session=session
+            )
+        with pytest.raises(StaleDataError):
+            widget_schema.load_update(
+                [{"id": 1, "name": "eins", "version": 1}], session=session, many=True
+            )
+
+    def test_load_update_rejects_relationships(
+        self, models, session, teacher, sqla_auto_model_schema_with_relationships
+    ):
+        with pytest.raises(ValueError, match="non-column"):
+            sqla_auto_model_schema_with_relationships.load_update(
+                {"id": teacher.id, "current_school": 42}, session=session
+            )
+
+
+class TestPolymorphicSchema:
+    @pytest.fixture
+    def PaperSchema(self, models):
+        class PaperSchema(SQLAlchemyPolymorphicSchema):
+            class Meta:
+                model = models.Paper
+                load_instance = True
+
+        return PaperSchema
+
+    @pytest.fixture
+    def papers(self, models, session):
+        papers = [
+            models.Paper(id=1, name="Essay"),
+            models.GradedPaper(id=2, name="Exam", marks_available=100),
+            models.GradedPaper(id=3, name="Quiz", marks_available=10),
+        ]
+        session.add_all(papers)
+        session.commit()
+        return papers
+
+    def test_dump(self, PaperSchema, papers):
+        schema = PaperSchema()
+        assert schema.dump(papers[0]) == {"id": 1, "name": "Essay", "satype": "paper"}
+        assert schema.dump(papers, many=True) == [
+            {"id": 1, "name": "Essay", "satype": "paper"},
+            {"id": 2, "name": "Exam", "satype": "gradedpaper", "marks_available": 100},
+            {"id": 3, "name": "Quiz", "satype": "gradedpaper", "marks_available": 10},
+        ]
+
+    def test_dump_with_only(self, PaperSchema, papers):
+        schema = PaperSchema(only=("id", "name"), many=True)
+        assert schema.dump(papers) == [
+            {"id": 1, "name": "Essay"},
+            {"id": 2, "name": "Exam"},
+            {"id": 3, "name": "Quiz"},
+        ]
+
+    def test_variant_classes_are_cached(self, models, PaperSchema, papers):
+        PaperSchema().dump(papers, many=True)
+        variant_class = PaperSchema._get_variant_class(sa.inspect(models.GradedPaper))
+        assert (
+            PaperSchema._get_variant_class(sa.inspect(models.GradedPaper))
+            is variant_class
+        )
+        assert "marks_available" in variant_class._declared_fields
+
+    def test_load(self, models, session, PaperSchema):
+        loaded = PaperSchema().load(
+            [
+                {"name": "Essay"},
+                {"name": "Exam", "satype": "gradedpaper", "marks_available": 100},
+                {"name": "Notes", "satype": "paper"},
+            ],
+            many=True,
+            session=session,
+        )
+        assert [type(paper) for paper in loaded] == [
+            models.Paper,
+            models.GradedPaper,
+            models.Paper,
+        ]
+        assert loaded[1].marks_available == 100
+
+    def test_load_existing_one_query_per_subclass(
+        self, models, session, PaperSchema, papers, statements
+    ):
+        session.expunge_all()
+        statements.clear()
+        loaded = PaperSchema(many=True).load(
+            [
+                {"id": 2, "name": "Exam 2", "satype": "gradedpaper"},
+                {"id": 1, "name": "Essay 2", "satype": "paper"},
+                {"id": 3, "name": "Quiz 2", "satype": "gradedpaper"},
+            ],
+            session=session,
+        )
+        assert [paper.id for paper in loaded] == [2, 1, 3]
+        assert all(sa.inspect(paper).persistent for paper in loaded)
+        assert loaded[1].name == "Essay 2"
+        selects = [stmt for stmt in statements if stmt.startswith("SELECT")]
+        assert len(selects) == 2
+
+    def test_load_errors_are_keyed_by_original_index(self, session, PaperSchema):
+        with pytest.raises(ValidationError) as excinfo:
+            PaperSchema().load(
+                [
+                    {"name": "Essay", "satype": "paper"},
+                    {"name": "Exam", "satype": "gradedpaper", "marks_available": "x"},
+                    {"name": "Poem", "satype": "poem"},
+                ],
+                many=True,
+                session=session,
+            )
+        assert excinfo.value.messages == {
+            1: {"marks_available": ["Not a valid integer."]},
+            2: {"satype": ["Unknown polymorphic identity 'poem'."]},
+        }
+
+    def test_validate(self, session, PaperSchema):
+        data = {"name": "Exam", "satype": "gradedpaper", "marks_available": 3}
+        assert PaperSchema().validate(data, session=session) == {}
+        PaperSchema().load(data, session=session)
+        assert PaperSchema().validate(
+            {"name": "Essay", "marks_available": 3}, session=session
+        ) == {"marks_available": ["Unknown field."]}
+
+    def test_validate_many(self, session, PaperSchema):
+        errors = PaperSchema().validate(
+            [
+                {"name": "Essay", "satype": "paper"},
+                {"name": "Exam", "satype": "gradedpaper", "marks_available": "x"},
+                {"name": "Poem", "satype": "poem"},
+                {"name": "Quiz", "satype": "gradedpaper", "marks_available": 3},
+            ],
+            many=True,
+            session=session,
+        )
+        assert errors == {
+            1: {"marks_available": ["Not a valid integer."]},
+            2: {"satype": ["Unknown polymorphic identity 'poem'."]},
+        }
+
+    def test_model_without_polymorphic_on(self, models, session, school):
+        class SchoolSchema(SQLAlchemyPolymorphicSchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+        schema = SchoolSchema()
+        loaded = schema.load({"id": 42, "name": "Renamed"}, session=session)
+        assert loaded is school
+        assert schema.validate([{"name": "New"}], many=True, session=session) == {}
+        assert schema.dump(school)["name"] == "Renamed"
+
+
 def test_related_when_model_attribute_name_distinct_from_column_name(
     models,
     session,
@@ -555,3 +1007,1252 @@ def test_dump_and_load_with_assoc_proxy_multiplicity_load_only_only_kwargs(
         {"student_identifiers": list(school.student_ids)}, transient=True
     )
     assert list(new_school.student_ids) == list(school.student_ids)
+
+
+class TestLoadColumns:
+    @pytest.fixture
+    def schema(self, models):
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+                fields = ("id", "name", "level", "has_prereqs")
+
+        return CourseSchema()
+
+    def test_load_columns(self, schema):
+        data = {
+            "id": [1, 2, 3],
+            "name": ["Math", "Physics", "Chemistry"],
+            "level": ["Primary", "Secondary", "Primary"],
+            "has_prereqs": [True, False, "true"],
+        }
+        assert schema.load_columns(data) == [
+            {"id": 1, "name": "Math", "level": "Primary", "has_prereqs": True},
+            {"id": 2, "name": "Physics", "level": "Secondary", "has_prereqs": False},
+            {"id": 3, "name": "Chemistry", "level": "Primary", "has_prereqs": True},
+        ]
+
+    def test_load_columns_errors_are_keyed_by_row(self, schema):
+        data = {
+            "id": [1, 2, 3],
+            "name": ["Math", None, "x" * 256],
+            "level": ["Primary", "Tertiary", "Tertiary"],
+            "has_prereqs": [True, False, True],
+        }
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load_columns(data)
+        errors = excinfo.value.messages
+        assert set(errors) == {1, 2}
+        assert set(errors[1]) == {"name", "level"}
+        assert set(errors[2]) == {"name", "level"}
+        assert excinfo.value.valid_data[0]["name"] == "Math"
+
+    def test_load_columns_missing_required_column(self, schema):
+        data = {"id": [1, 2], "level": ["Primary", "Primary"]}
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load_columns(data)
+        assert excinfo.value.messages[0]["name"] == ["Missing data for required field."]
+        assert schema.load_columns(data, partial=True) == [
+            {"id": 1, "level": "Primary"},
+            {"id": 2, "level": "Primary"},
+        ]
+
+    def test_load_columns_unknown(self, schema):
+        data = {"name": ["Math"], "has_prereqs": [True], "extra": [42]}
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load_columns(data)
+        assert excinfo.value.messages == {0: {"extra": ["Unknown field."]}}
+        assert schema.load_columns(data, unknown=marshmallow.INCLUDE) == [
+            {"name": "Math", "has_prereqs": True, "extra": 42}
+        ]
+
+    @pytest.mark.parametrize(
+        "values", ["Math", {"a": "Math"}, (name for name in ["Math"]), 42]
+    )
+    def test_load_columns_requires_sequences(self, schema, values):
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load_columns({"name": values})
+        assert excinfo.value.messages == {"name": ["Invalid input type."]}
+
+    def test_load_columns_requires_equal_lengths(self, schema):
+        with pytest.raises(ValidationError, match="same length"):
+            schema.load_columns({"name": ["Math"], "has_prereqs": [True, False]})
+
+
+class TestDumpJson:
+    @pytest.fixture
+    def course(self, models):
+        return models.Course(
+            id=1,
+            name="Math",
+            cost=decimal.Decimal("12.50"),
+            description=None,
+            level="Primary",
+            level_with_enum_class=models.Course.level_with_enum_class.type.enum_class[
+                "PRIMARY"
+            ],
+            has_prereqs=True,
+            started=dt.datetime(2024, 1, 2, 3, 4, 5, 678),
+            grade=3,
+            transcription="...",
+        )
+
+    @pytest.fixture
+    def schema(self, models):
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+
+        return CourseSchema()
+
+    def test_dump_json_matches_dumps(self, schema, course):
+        expected = json.loads(schema.dumps(course, default=str))
+        assert json.loads(schema.dump_json(course)) == expected
+        assert json.loads(schema.dump_json([course, course], many=True)) == [
+            expected,
+            expected,
+        ]
+
+    def test_dump_json_without_orjson(self, schema, course, monkeypatch):
+        monkeypatch.setattr(encoders, "orjson", None)
+        expected = json.loads(schema.dumps(course, default=str))
+        assert json.loads(type(schema)().dump_json(course)) == expected
+
+    def test_dump_json_matches_dump_with_field_options(self, models, course):
+        class CourseSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Course
+
+            id = auto_field(as_string=True)
+            grade = auto_field(as_string=True)
+            started = auto_field(format="%Y-%m-%d")
+            level = auto_field()
+            tags = marshmallow.fields.List(marshmallow.fields.String())
+            scores = marshmallow.fields.List(marshmallow.fields.Integer())
+
+        course.tags = [1, "two", None]
+        course.scores = [1, 2]
+        schema = CourseSchema()
+        expected = schema.dump(course)
+        assert expected["id"] == "1"
+        assert expected["tags"] == ["1", "two", None]
+        assert json.loads(schema.dump_json(course)) == expected
+
+    def test_dump_json_runs_dump_processors(self, models, course):
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+                fields = ("id", "name")
+
+            @marshmallow.post_dump
+            def upper(self, data, **kwargs):
+                data["name"] = data["name"].upper()
+                return data
+
+        assert json.loads(CourseSchema().dump_json(course)) == {"id": 1, "name": "MATH"}
+
+    def test_json_encoder_option(self, models, course):
+        encoded = []
+
+        def encode(data):
+            encoded.append(data)
+            return b"encoded"
+
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+                fields = ("id", "started")
+                json_encoder = staticmethod(encode)
+
+        assert CourseSchema().dump_json(course) == b"encoded"
+        started = dt.datetime(2024, 1, 2, 3, 4, 5, 678)
+        # Datetimes are passed as-is to orjson, and formatted otherwise
+        if encoders.orjson is None:
+            started = started.isoformat()
+        assert encoded == [{"id": 1, "started": started}]
+
+
+class TestWarmUp:
+    @pytest.fixture
+    def schema_class(self, models):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+
+            name = auto_field()
+
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+
+            current_school = Nested(SchoolSchema)
+            courses = auto_field()
+
+        return StudentSchema
+
+    def test_warm_up_resolves_related_fields(self, models, schema_class):
+        courses = schema_class._declared_fields["courses"].inner
+        assert courses._resolved == {}
+        schema_class.warm_up()
+        assert courses._resolved == {
+            (models.Student, "courses"): (
+                models.Course,
+                [models.Course.id.property],
+                ("id",),
+            )
+        }
+        # Copies made for new schema instances share the resolved values
+        assert schema_class().fields["courses"].inner._resolved is courses._resolved
+
+    def test_warm_up_nested_schemas(self, schema_class, monkeypatch):
+        warmed_up = []
+        original = SQLAlchemySchema._warm_up.__func__
+
+        def _warm_up(cls, seen):
+            warmed_up.append(cls.__name__)
+            return original(cls, seen)
+
+        monkeypatch.setattr(SQLAlchemySchema, "_warm_up", classmethod(_warm_up))
+        schema_class.warm_up()
+        assert warmed_up == ["StudentSchema", "SchoolSchema"]
+
+    def test_warm_up_polymorphic_schema(self, models):
+        class PaperSchema(SQLAlchemyPolymorphicSchema):
+            class Meta:
+                model = models.Paper
+
+        PaperSchema.warm_up()
+        assert set(PaperSchema._variant_classes) == {
+            sa.inspect(models.Paper),
+            sa.inspect(models.GradedPaper),
+        }
+
+    def test_warm_up_does_not_instantiate_schemas(self, models):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+
+            def __init__(self, user, **kwargs):
+                super().__init__(**kwargs)
+
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+
+            current_school = Nested(lambda: SchoolSchema)
+            courses = auto_field()
+
+            def __init__(self, user, **kwargs):
+                super().__init__(**kwargs)
+
+        seen = set()
+        StudentSchema._warm_up(seen)
+        assert seen == {StudentSchema, SchoolSchema}
+        assert StudentSchema._declared_fields["courses"].inner._resolved
+        warm_up_all()
+
+    def test_warm_up_all(self, schema_class, monkeypatch):
+        frozen = []
+        monkeypatch.setattr("gc.freeze", lambda: frozen.append(True))
+        warm_up_all(freeze=True)
+        assert schema_class._declared_fields["courses"].inner._resolved
+        assert frozen == [True]
+
+
+class TestShareFields:
+    @pytest.fixture
+    def schema_class(self, models):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_relationships = True
+                load_instance = True
+                share_fields = True
+
+            url = marshmallow.fields.String(dump_only=True)
+
+        return StudentSchema
+
+    def test_converted_fields_are_shared(self, schema_class):
+        first, second = schema_class(), schema_class()
+        assert first.fields["full_name"] is second.fields["full_name"]
+        assert first.fields["date_created"] is second.fields["date_created"]
+        # Fields that depend on the schema instance are copied
+        assert first.fields["current_school"] is not second.fields["current_school"]
+        assert first.fields["courses"] is not second.fields["courses"]
+
+    def test_declared_fields_are_not_shared(self, schema_class):
+        assert schema_class().fields["url"] is not schema_class().fields["url"]
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"only": ("id", "full_name")},
+            {"exclude": ("url",)},
+            {"load_only": ("full_name",)},
+            {"dump_only": ("full_name",)},
+        ],
+    )
+    def test_fields_are_copied_with_options(self, schema_class, kwargs):
+        schema = schema_class(**kwargs)
+        assert schema.fields["full_name"] is not schema_class().fields["full_name"]
+        assert schema_class().fields["full_name"].load_only is False
+        assert schema_class().fields["full_name"].dump_only is False
+
+    def test_load_and_dump_with_shared_fields(self, schema_class, school, session):
+        schema = schema_class()
+        student = schema.load(
+            {"full_name": "Alice", "current_school": 42}, session=session
+        )
+        assert student.current_school is school
+        session.add(student)
+        session.flush()
+        assert schema_class().dump(student)["full_name"] == "Alice"
+        with pytest.raises(ValidationError) as excinfo:
+            schema_class().load({"full_name": "x" * 256}, session=session)
+        assert "full_name" in excinfo.value.messages
+
+
+class TestProjectionCache:
+    @pytest.fixture
+    def schema_class(self, models):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_relationships = True
+                load_instance = True
+                projection_cache_size = 2
+
+        return StudentSchema
+
+    def test_projection_fields_are_reused(self, schema_class):
+        first = schema_class(only=("id", "full_name"))
+        second = schema_class(only=["full_name", "id"])
+        assert set(second.fields) == {"id", "full_name"}
+        assert first.fields["full_name"] is second.fields["full_name"]
+        assert first.fields is not second.fields
+        other = schema_class(only=("id", "full_name"), dump_only=("full_name",))
+        assert other.fields["full_name"] is not first.fields["full_name"]
+        assert other.fields["full_name"].dump_only is True
+        assert second.fields["full_name"].dump_only is False
+
+    def test_lru_eviction(self, schema_class):
+        first = schema_class(only=("id",))
+        schema_class(exclude=("dob",))
+        schema_class(only=("id",))
+        schema_class(only=("full_name",))
+        assert len(schema_class._projection_cache) == 2
+        assert schema_class(only=("id",)).fields["id"] is first.fields["id"]
+        assert schema_class(exclude=("dob",)).fields["id"] is not first.fields["id"]
+
+    def test_context_is_not_cached(self, schema_class):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            schema = schema_class(context={"foo": "bar"})
+        assert schema.fields["id"] is not schema_class().fields["id"]
+
+    def test_instance_dependent_fields_are_not_reused(self, models):
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+                projection_cache_size = 2
+
+            id = auto_field()
+            who = marshmallow.fields.Method("get_who")
+
+            def __init__(self, *args, user=None, **kwargs):
+                self.user = user
+                super().__init__(*args, **kwargs)
+
+            def get_who(self, obj):
+                return self.user
+
+        student = models.Student(id=1, full_name="Alice")
+        alice = StudentSchema(only=("id", "who"), user="alice")
+        bob = StudentSchema(only=("id", "who"), user="bob")
+        assert bob.fields["id"] is alice.fields["id"]
+        assert bob.fields["who"] is not alice.fields["who"]
+        assert alice.dump(student) == {"id": 1, "who": "alice"}
+        assert bob.dump(student) == {"id": 1, "who": "bob"}
+
+    def test_load_and_dump_with_cached_projection(self, schema_class, school, session):
+        only = ("id", "full_name", "current_school")
+        schema_class(only=only)
+        schema = schema_class(only=only)
+        student = schema.load(
+            {"full_name": "Alice", "current_school": 42}, session=session
+        )
+        assert student.current_school is school
+        session.add(student)
+        session.flush()
+        assert schema.dump(student) == {
+            "id": student.id,
+            "full_name": "Alice",
+            "current_school": 42,
+        }
+
+
+class TestSchemasForMetadata:
+    def test_schemas_are_built_on_access(self, models, Base):
+        schemas = schemas_for_metadata(Base.metadata)
+        assert set(schemas) == set(Base.metadata.tables)
+        assert len(schemas) == len(Base.metadata.tables)
+        assert schemas._schemas == {}
+        StudentSchema = schemas["student"]
+        assert set(schemas._schemas) == {"student"}
+        assert schemas["student"] is StudentSchema
+        assert StudentSchema.__name__ == "StudentSchema"
+        assert issubclass(StudentSchema, SQLAlchemyAutoSchema)
+        assert "full_name" in StudentSchema().fields
+        assert "current_school_id" not in StudentSchema().fields
+        with pytest.raises(KeyError):
+            schemas["nope"]
+
+    def test_options_and_shared_converter(self, models, Base):
+        converter = ModelConverter()
+        schemas = schemas_for_metadata(
+            Base.metadata, converter=converter, include_fk=True
+        )
+        assert schemas["student"].opts.model_converter is converter
+        assert schemas["teacher"].opts.model_converter is converter
+        assert "current_school_id" in schemas["student"]().fields
+        assert sa.String in converter._sqla_type_mapping_cache
+
+    def test_prebuild(self, models, Base):
+        schemas = schemas_for_metadata(Base.metadata, prebuild=True, max_workers=4)
+        assert set(schemas._schemas) == set(Base.metadata.tables)
+
+
+class TestNestedMemoize:
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def schema(self, models, calls):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+
+            id = auto_field()
+            name = auto_field()
+            calls_ = marshmallow.fields.Function(
+                lambda obj: calls.append(obj) or len(calls)
+            )
+
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+
+            id = auto_field()
+            current_school = Nested(SchoolSchema, memoize=True)
+
+        return StudentSchema()
+
+    def test_related_object_is_serialized_once_per_dump(self, schema, school, calls):
+        students = school.students * 3
+        dumped = schema.dump(students, many=True)
+        assert calls == [school]
+        school_data = dumped[0]["current_school"]
+        assert all(item["current_school"] is school_data for item in dumped)
+        assert dumped[0]["current_school"] == {
+            "id": 42,
+            "name": "Univ. Of Whales",
+            "calls_": 1,
+        }
+        # The memo is not kept between dumps
+        dumped = json.loads(schema.dump_json(students, many=True))
+        assert [item["current_school"]["calls_"] for item in dumped] == [2] * 6
+        assert calls == [school, school]
+
+    def test_modified_objects_are_not_memoized(self, schema, school, calls):
+        school.name = "Univ. Of Dolphins"
+        schema.dump(school.students, many=True)
+        assert calls == [school, school]
+
+    def test_memoize_many(self, models, school, calls, schema):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+
+            students = Nested(type(schema), many=True, memoize=True)
+
+        dumped = SchoolSchema().dump([school, school], many=True)
+        assert dumped[0]["students"][0] is dumped[1]["students"][0]
+        assert len(calls) == 1
+
+
+class TestReferenceOnlyRelated:
+    @pytest.fixture
+    def schema(self, models):
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+                load_instance = True
+
+            full_name = auto_field()
+            current_school = Related(reference_only=True)
+
+        return StudentSchema()
+
+    def test_sets_foreign_key_without_query(self, schema, school, session, statements):
+        student = schema.load(
+            {"full_name": "Alice", "current_school": 42}, session=session
+        )
+        assert statements == []
+        assert student.current_school_id == 42
+        session.add(student)
+        session.flush()
+        assert student.current_school is school
+
+    def test_load_without_instance(self, schema, session):
+        data = schema.load(
+            {"full_name": "Alice", "current_school": {"id": 42}},
+            session=session,
+            load_instance=False,
+        )
+        assert data == {"full_name": "Alice", "current_school_id": 42}
+
+    def test_load_columns(self, schema):
+        rows = schema.load_columns(
+            {"full_name": ["Alice", "Bob"], "current_school": [42, 42]}
+        )
+        assert rows == [
+            {"full_name": "Alice", "current_school_id": 42},
+            {"full_name": "Bob", "current_school_id": 42},
+        ]
+
+    @pytest.mark.parametrize("value", ["abc", [1, 2], {"id": {"x": 1}}, {"id": "abc"}])
+    def test_invalid_key(self, schema, session, value):
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(
+                {"full_name": "Alice", "current_school": value}, session=session
+            )
+        (message,) = excinfo.value.messages["current_school"]
+        assert message.startswith("Could not deserialize related value")
+
+    def test_key_is_deserialized(self, schema, session):
+        student = schema.load(
+            {"full_name": "Alice", "current_school": "42"}, session=session
+        )
+        assert student.current_school_id == 42
+
+    def test_composite_key(self, models, session):
+        class LectureSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Lecture
+                load_instance = True
+
+            seminar = Related(reference_only=True)
+
+        lecture = LectureSchema().load(
+            {"seminar": {"title": "Physics", "semester": "Fall"}}, session=session
+        )
+        assert lecture.seminar_title == "Physics"
+        assert lecture.seminar_semester == "Fall"
+        with pytest.raises(ValidationError, match="Could not deserialize"):
+            LectureSchema().load({"seminar": {"title": "Physics"}}, session=session)
+        with pytest.raises(ValidationError, match="Could not deserialize"):
+            LectureSchema().load(
+                {"seminar": {"title": "Physics", "semester": 1}}, session=session
+            )
+
+    def test_requires_many_to_one(self, models, school, session):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+            students = RelatedList(Related(reference_only=True))
+
+        with pytest.raises(ValueError, match="many-to-one"):
+            SchoolSchema().load({"students": [1]}, session=session)
+
+
+class TestValidateForeignKeys:
+    @pytest.fixture
+    def schema(self, models):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                validate_foreign_keys = True
+                fields = ("full_name", "current_school_id")
+
+        return StudentSchema()
+
+    def test_one_query_per_constraint(self, schema, school, session, statements):
+        data = [
+            {"full_name": f"Student {index}", "current_school_id": school_id}
+            for index, school_id in enumerate((42, 43, 42, 44))
+        ]
+        statements.clear()
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(data, many=True, session=session)
+        assert excinfo.value.messages == {
+            1: {"current_school_id": ["Related school row does not exist."]},
+            3: {"current_school_id": ["Related school row does not exist."]},
+        }
+        assert len(statements) == 1
+        assert schema.load(data[::2], many=True, session=session) == data[::2]
+
+    def test_single_item(self, schema, school, session):
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load({"full_name": "Bob", "current_school_id": 1}, session=session)
+        assert excinfo.value.messages == {
+            "current_school_id": ["Related school row does not exist."]
+        }
+
+    def test_reported_with_field_errors(self, schema, school, session):
+        data = [{"current_school_id": 1}]
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(data, many=True, session=session)
+        assert set(excinfo.value.messages[0]) == {"full_name", "current_school_id"}
+
+    def test_reference_only_related(self, models, school, session):
+        class LectureSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Lecture
+                validate_foreign_keys = True
+
+            seminar = Related(reference_only=True, data_key="seminar_key")
+
+        session.add(models.Seminar(title="Physics", semester="Fall"))
+        session.flush()
+        data = [
+            {"seminar_key": {"title": "Physics", "semester": "Fall"}},
+            {"seminar_key": {"title": "Physics", "semester": "Spring"}},
+        ]
+        with pytest.raises(ValidationError) as excinfo:
+            LectureSchema().load(data, many=True, session=session)
+        assert excinfo.value.messages == {
+            1: {"seminar_key": ["Related seminar row does not exist."]}
+        }
+
+    def test_custom_error_message(self, models, school, session):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                validate_foreign_keys = True
+                fields = ("current_school_id",)
+
+            error_messages = {"foreign_key": "Unknown {table}."}
+
+        with pytest.raises(ValidationError) as excinfo:
+            StudentSchema().load({"current_school_id": 1}, session=session)
+        assert excinfo.value.messages == {"current_school_id": ["Unknown school."]}
+
+
+class TestValidateUnique:
+    @pytest.fixture
+    def schema(self, models):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                load_instance = True
+                validate_unique = True
+                fields = ("id", "full_name", "current_school_id")
+
+        return StudentSchema()
+
+    def test_batch(self, schema, school, session, statements):
+        data = [
+            {"full_name": "Bob Smith", "current_school_id": 42},
+            {"full_name": "Alice", "current_school_id": 42},
+            {"full_name": "Alice", "current_school_id": 42},
+            {"id": 53, "full_name": "John Johnson", "current_school_id": 42},
+        ]
+        statements.clear()
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(data, many=True, session=session)
+        assert excinfo.value.messages == {
+            0: {"full_name": ["A student row with this value already exists."]},
+            2: {"full_name": ["Value is not unique within the payload (see item 1)."]},
+        }
+        # The prefetch of existing instances and one query for the constraint
+        assert len([s for s in statements if "full_name IN" in s]) == 1
+
+    def test_update_of_existing_instance(self, schema, school, session):
+        student = session.get(type(school.students[0]), 35)
+        loaded = schema.load(
+            {"full_name": "Bob Smith", "current_school_id": 42},
+            instance=student,
+            session=session,
+        )
+        assert loaded is student
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(
+                {"full_name": "John Johnson", "current_school_id": 42},
+                instance=student,
+                session=session,
+            )
+        assert "full_name" in excinfo.value.messages
+
+    def test_transient_checks_payload_only(self, schema, school, statements):
+        data = [
+            {"full_name": "Bob Smith", "current_school_id": 42},
+            {"full_name": "Bob Smith", "current_school_id": 42},
+        ]
+        statements.clear()
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(data, many=True, transient=True)
+        assert list(excinfo.value.messages) == [1]
+        assert statements == []
+
+    def test_composite_unique_constraint(self, models, Base, engine):
+        class Enrollment(Base):
+            __tablename__ = "enrollment"
+            id = sa.Column(sa.Integer, primary_key=True)
+            student_id = sa.Column(sa.Integer, nullable=False)
+            course_id = sa.Column(sa.Integer, nullable=False)
+            __table_args__ = (sa.UniqueConstraint("student_id", "course_id"),)
+
+        class EnrollmentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = Enrollment
+                validate_unique = True
+
+        Base.metadata.create_all(engine)
+        session = sa.orm.Session(engine)
+        session.add(Enrollment(id=1, student_id=1, course_id=1))
+        session.flush()
+        with pytest.raises(ValidationError) as excinfo:
+            EnrollmentSchema().load(
+                [
+                    {"student_id": 1, "course_id": 2},
+                    {"student_id": 1, "course_id": 1},
+                ],
+                many=True,
+                session=session,
+            )
+        assert set(excinfo.value.messages) == {1}
+        assert set(excinfo.value.messages[1]) == {"student_id", "course_id"}
+
+
+class TestTrustNativeTypes:
+    @pytest.fixture
+    def schema(self, models):
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+                trust_native_types = True
+
+        return CourseSchema(transient=True)
+
+    @pytest.fixture
+    def data(self):
+        return {
+            "name": "Physics",
+            "cost": decimal.Decimal("12.345"),
+            "has_prereqs": False,
+            "started": dt.datetime(2024, 1, 2, 3, 4, 5),
+            "grade": 1,
+            "transcription": "Text",
+        }
+
+    def test_native_values_are_loaded_as_is(self, schema, data):
+        result = schema.load(data)
+        assert result["started"] is data["started"]
+
+    def test_decimals_are_rounded(self, schema, data):
+        assert schema.load(data)["cost"] == decimal.Decimal("12.34")
+
+    def test_special_numeric_values_are_rejected(self, schema, data):
+        data["cost"] = decimal.Decimal("NaN")
+        assert "cost" in schema.validate(data)
+        field = ModelConverter().column2field(
+            sa.Column("score", sa.Float), trust_native_types=True
+        )
+        with pytest.raises(ValidationError, match="Special numeric values"):
+            field.deserialize(float("nan"))
+
+    def test_other_values_are_deserialized(self, schema, data):
+        data.update(started="2024-01-02T03:04:05", cost="1.5")
+        result = schema.load(data)
+        assert result["started"] == dt.datetime(2024, 1, 2, 3, 4, 5)
+        assert result["cost"] == decimal.Decimal("1.50")
+
+    def test_subclass_of_native_type_is_deserialized(self, schema, data):
+        data["grade"] = True
+        assert "grade" in schema.validate(data)
+
+    def test_constraints_still_apply(self, schema, data):
+        data.update(name="x" * 256, level="Tertiary", started=None)
+        errors = schema.validate(data)
+        assert set(errors) == {"name", "level", "started"}
+
+    def test_fields_keep_their_class(self, schema):
+        field = schema.fields["started"]
+        assert isinstance(field, marshmallow.fields.DateTime)
+        assert type(field).__name__ == "DateTime"
+        assert encoders.get_fast_serializer(field) is not None
+
+    def test_auto_field(self, models):
+        class CourseSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Course
+                trust_native_types = True
+
+            started = auto_field()
+
+        started = dt.datetime(2024, 1, 2)
+        assert CourseSchema().load({"started": started})["started"] is started
+
+    def test_disabled_by_default(self, models):
+        class CourseSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Course
+
+        assert not hasattr(CourseSchema().fields["started"], "native_type")
+
+
+class TestIngest:
+    @pytest.fixture
+    def schema(self, models):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                fields = ("id", "full_name", "current_school_id")
+
+        return StudentSchema()
+
+    def records(self, num_records):
+        for index in range(num_records):
+            yield {"full_name": f"Student {index}", "current_school_id": 42}
+
+    def test_ingest(self, schema, school, session, models):
+        commits = []
+        sa.event.listen(session, "after_commit", commits.append)
+        count = schema.ingest(self.records(5), session, batch_size=2)
+        assert count == 5
+        assert len(commits) == 3
+        assert len(session.identity_map) == 0
+        assert session.query(models.Student).count() == 7
+
+    def test_updates_existing_instances(self, schema, school, session, models):
+        records = [{"id": 35, "full_name": "Bob", "current_school_id": 42}]
+        assert schema.ingest(records, session) == 1
+        assert session.get(models.Student, 35).full_name == "Bob"
+        assert session.query(models.Student).count() == 2
+
+    def test_errors_are_raised_by_default(self, schema, school, session, models):
+        records = [*self.records(2), {"full_name": None}]
+        with pytest.raises(ValidationError) as excinfo:
+            schema.ingest(records, session, batch_size=2)
+        assert set(excinfo.value.messages) == {0}
+        # The first batch is committed
+        assert session.query(models.Student).count() == 4
+
+    def test_on_error(self, schema, school, session, models):
+        records = list(self.records(4))
+        records[2] = {"full_name": None, "current_school_id": 42}
+        errors = []
+        count = schema.ingest(
+            records,
+            session,
+            batch_size=3,
+            on_error=lambda error, batch, offset: errors.append(
+                (error.messages, batch, offset)
+            ),
+        )
+        assert count == 3
+        messages = {2: {"full_name": ["Field may not be null."]}}
+        assert errors == [(messages, records[:3], 0)]
+        names = {student.full_name for student in session.query(models.Student)}
+        assert names >= {"Student 0", "Student 1", "Student 3"}
+
+    def test_on_error_second_pass(self, models, school, session):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                load_instance = True
+                fields = ("id", "full_name", "current_school_id")
+
+            # Skipped while there are field errors, so it only fails the second pass
+            @validates_schema(pass_many=True)
+            def validate_names(self, data, many, **kwargs):
+                if many:
+                    raise ValidationError(
+                        {
+                            index: {"full_name": ["Reserved."]}
+                            for index, item in enumerate(data)
+                            if item["full_name"] == "Student 3"
+                        }
+                    )
+
+        records = list(self.records(4))
+        records[1] = {"full_name": None, "current_school_id": 42}
+        errors = []
+        count = StudentSchema().ingest(
+            records,
+            session,
+            on_error=lambda error, batch, offset: errors.append(
+                (error.messages, batch, offset)
+            ),
+        )
+        assert count == 0
+        assert errors == [
+            ({1: {"full_name": ["Field may not be null."]}}, records, 0),
+            ({3: {"full_name": ["Reserved."]}}, records, 0),
+        ]
+
+    def test_invalid_batch_size(self, schema, session):
+        with pytest.raises(ValueError, match="batch_size"):
+            schema.ingest([], session, batch_size=0)
+
+
+class TestLookupSession:
+    @pytest.fixture
+    def replica(self, models, Base):
+        replica = sa.create_engine("sqlite:///:memory:", future=True)
+        Base.metadata.create_all(replica)
+        with sa.orm.Session(replica) as session:
+            school = models.School(id=42, name="Replica School")
+            session.add_all(
+                [
+                    school,
+                    models.Student(id=35, full_name="Bob Smith", current_school=school),
+                    models.Student(id=99, full_name="Replica", current_school=school),
+                ]
+            )
+            session.commit()
+        return replica
+
+    @pytest.fixture
+    def schema(self, models, replica):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_relationships = True
+                load_instance = True
+                lookup_bind = replica
+                fields = ("id", "full_name", "current_school")
+
+        return StudentSchema()
+
+    def test_instances_are_looked_up_in_replica(self, schema, session, statements):
+        student = schema.load(
+            {"id": 99, "full_name": "Updated", "current_school": 42}, session=session
+        )
+        assert student in session
+        assert student.full_name == "Updated"
+        assert student.current_school in session
+        assert student.current_school.name == "Replica School"
+        assert statements == []
+
+    def test_prefetched_instances_are_attached(self, schema, session, statements):
+        students = schema.load(
+            [
+                {"id": 35, "full_name": "Bob", "current_school": 42},
+                {"id": 99, "full_name": "Replica", "current_school": 42},
+            ],
+            many=True,
+            session=session,
+        )
+        assert all(student in session for student in students)
+        assert students[0].current_school is students[1].current_school
+        assert statements == []
+
+    def test_instances_in_session_are_kept(self, schema, school, session, statements):
+        student = session.get(type(school.students[0]), 35)
+        student.full_name = "Pending"
+        statements.clear()
+        loaded = schema.load(
+            {"id": 35, "current_school": 42}, session=session, partial=True
+        )
+        assert loaded is student
+        assert loaded.full_name == "Pending"
+        assert loaded.current_school is school
+        assert statements == []
+
+    def test_validate_foreign_keys(self, models, replica, session, statements):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                validate_foreign_keys = True
+                lookup_bind = replica
+
+        data = {"full_name": "New", "current_school_id": 42}
+        assert StudentSchema().validate(data, session=session) == {}
+        assert statements == []
+
+    def test_lookup_session(self, models, replica, session):
+        replica_session = sa.orm.Session(replica)
+
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                load_instance = True
+                lookup_session = replica_session
+
+        student = StudentSchema().load({"id": 99}, session=session, partial=True)
+        assert student in session
+        assert student not in replica_session
+        assert StudentSchema().lookup_session is replica_session
+
+    def test_cannot_set_lookup_session_and_bind(self, models, replica):
+        with pytest.raises(ValueError, match="lookup_session"):
+
+            class StudentSchema(SQLAlchemyAutoSchema):
+                class Meta:
+                    model = models.Student
+                    lookup_session = sa.orm.Session(replica)
+                    lookup_bind = replica
+
+
+class TestRelatedLookups:
+    @pytest.fixture
+    def school_schema(self, models):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+            name = auto_field()
+            students = RelatedList(Related(columns=["full_name"]))
+
+        return SchoolSchema()
+
+    def test_statement_is_built_once(self, models, school, session):
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+                load_instance = True
+
+            current_school = Related(columns=["name"])
+
+        schema = StudentSchema()
+        result = schema.load({"current_school": "Univ. Of Whales"}, session=session)
+        assert result.current_school is school
+        field = schema.fields["current_school"]
+        statement = field._get_statement()
+        assert StudentSchema().fields["current_school"]._get_statement() is statement
+
+    def test_related_list_uses_one_query(
+        self, school_schema, school, session, statements
+    ):
+        session.expunge_all()
+        statements.clear()
+        result = school_schema.load(
+            {"name": "School", "students": ["Bob Smith", "John Johnson"]},
+            session=session,
+        )
+        assert sorted(student.id for student in result.students) == [35, 53]
+        assert len([s for s in statements if "FROM student" in s]) == 1
+
+    def test_related_list_by_primary_key(self, models, school, session, statements):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                load_instance = True
+
+            students = RelatedList(Related())
+
+        session.expunge_all()
+        statements.clear()
+        result = SchoolSchema().load({"students": [35, 53]}, session=session)
+        assert [student.id for student in result.students] == [35, 53]
+        assert len([s for s in statements if "FROM student" in s]) == 1
+        statements.clear()
+        SchoolSchema().load({"students": [35, 53]}, session=session)
+        # Instances in the session are used without a query
+        assert not [s for s in statements if "FROM student" in s]
+
+    def test_values_not_found_are_looked_up_individually(
+        self, models, school_schema, school, session
+    ):
+        result = school_schema.load(
+            {"name": "School", "students": ["Bob Smith", "New Student"]},
+            session=session,
+        )
+        assert result.students[0].id == 35
+        assert result.students[1].full_name == "New Student"
+        assert sa.inspect(result.students[1]).transient
+
+
+class TestInstanceLookupKeys:
+    @pytest.fixture
+    def Account(self, Base, engine):
+        class Account(Base):
+            __tablename__ = "account"
+            id = sa.Column(sa.Integer, primary_key=True)
+            tenant_id = sa.Column(sa.Integer, nullable=False)
+            external_id = sa.Column(sa.String(50), nullable=False)
+            name = sa.Column(sa.String(50))
+            __table_args__ = (sa.Index("ix_account_key", tenant_id, external_id),)
+
+        Base.metadata.create_all(engine)
+        return Account
+
+    @pytest.fixture
+    def account_session(self, Account, engine):
+        session = sa.orm.Session(engine)
+        session.add_all(
+            [
+                Account(id=1, tenant_id=1, external_id="a", name="A"),
+                Account(id=2, tenant_id=1, external_id="b", name="B"),
+                Account(id=3, tenant_id=2, external_id="a", name="Other tenant"),
+            ]
+        )
+        session.commit()
+        session.expunge_all()
+        return session
+
+    @pytest.fixture
+    def schema(self, Account):
+        class AccountSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = Account
+                load_instance = True
+                instance_lookup_keys = ("tenant_id", "external_id")
+
+        return AccountSchema()
+
+    def test_load(self, schema, account_session):
+        account = schema.load(
+            {"tenant_id": 2, "external_id": "a", "name": "Renamed"},
+            session=account_session,
+        )
+        assert account.id == 3
+        assert account.name == "Renamed"
+        new = schema.load({"tenant_id": 2, "external_id": "b"}, session=account_session)
+        assert new.id is None
+
+    def test_load_many_uses_one_query(self, schema, account_session, statements):
+        statements.clear()
+        accounts = schema.load(
+            [
+                {"tenant_id": 1, "external_id": "a"},
+                {"tenant_id": 1, "external_id": "b"},
+                {"tenant_id": 1, "external_id": "c"},
+            ],
+            many=True,
+            session=account_session,
+        )
+        assert [account.id for account in accounts] == [1, 2, None]
+        assert len(statements) == 1
+
+    def test_single_key(self, models, school, session):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                load_instance = True
+                instance_lookup_keys = "full_name"
+                validate_unique = True
+
+        student = StudentSchema().load(
+            {"full_name": "Bob Smith", "current_school_id": 42}, session=session
+        )
+        assert student.id == 35
+
+
+class TestDumpUnloaded:
+    def make_schema(self, models, mode, **kwargs):
+        class StudentSchema(SQLAlchemyAutoSchema):
+            class Meta:
+                model = models.Student
+                include_fk = True
+                include_relationships = True
+                dump_unloaded = mode
+                fields = ("id", "full_name", "dob", "current_school")
+
+        return StudentSchema(**kwargs)
+
+    def test_exclude(self, models, school, session, statements):
+        session.expunge_all()
+        student = session.scalars(
+            sa.select(models.Student)
+            .where(models.Student.id == 35)
+            .options(sa.orm.defer(models.Student.dob))
+        ).one()
+        statements.clear()
+        schema = self.make_schema(models, EXCLUDE)
+        assert schema.dump(student) == {"id": 35, "full_name": "Bob Smith"}
+        assert json.loads(schema.dump_json(student)) == {
+            "id": 35,
+            "full_name": "Bob Smith",
+        }
+        assert statements == []
+
+    def test_loaded_relationship_is_dumped(self, models, school, session, statements):
+        session.expunge_all()
+        student = session.scalars(
+            sa.select(models.Student)
+            .where(models.Student.id == 35)
+            .options(sa.orm.joinedload(models.Student.current_school))
+        ).one()
+        statements.clear()
+        result = self.make_schema(models, EXCLUDE).dump(student)
+        assert result["current_school"] == 42
+        assert statements == []
+
+    def test_raise(self, models, school, session, statements):
+        student = school.students[0]
+        session.expire(student, ["full_name"])
+        statements.clear()
+        with pytest.raises(UnloadedAttributeError, match="'full_name' of Student"):
+            self.make_schema(models, RAISE, only=("full_name",)).dump(student)
+        assert statements == []
+
+    def test_proxies_and_dotted_paths(self, models, school, session, statements):
+        class SchoolSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.School
+                dump_unloaded = EXCLUDE
+
+            id = auto_field()
+            student_ids = marshmallow.fields.List(marshmallow.fields.Integer())
+
+        class StudentSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Student
+                dump_unloaded = EXCLUDE
+
+            id = auto_field()
+            school_name = marshmallow.fields.String(attribute="current_school.name")
+
+        session.expunge_all()
+        loaded_school = session.get(models.School, 42)
+        student = session.get(models.Student, 35)
+        statements.clear()
+        assert SchoolSchema().dump(loaded_school) == {"id": 42}
+        assert StudentSchema().dump(student) == {"id": 35}
+        assert statements == []
+        assert student.current_school is loaded_school
+        session.expire(loaded_school, ["name"])
+        statements.clear()
+        assert StudentSchema().dump(student) == {"id": 35}
+        assert statements == []
+
+    def test_synonym(self, models, school, session, statements):
+        class TeacherSchema(SQLAlchemySchema):
+            class Meta:
+                model = models.Teacher
+                dump_unloaded = RAISE
+
+            curr_school_id = auto_field()
+
+        teacher = models.Teacher(id=1, current_school=school)
+        session.add(teacher)
+        session.flush()
+        session.expire(teacher, ["current_school_id"])
+        statements.clear()
+        with pytest.raises(UnloadedAttributeError, match="'current_school_id'"):
+            TeacherSchema().dump(teacher)
+        assert statements == []
+
+    def test_instances_without_identity(self, models):
+        student = models.Student(full_name="New")
+        result = self.make_schema(models, RAISE).dump(student)
+        assert result["full_name"] == "New"
+        assert result["dob"] is None
+
+    def test_invalid_option(self, models):
+        with pytest.raises(ValueError, match="dump_unloaded"):
+            self.make_schema(models, "skip")